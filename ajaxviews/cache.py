@@ -0,0 +1,118 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
+
+from .conf import settings
+
+
+def get_cache():
+    """
+    :return: Django cache backend configured with ``CACHE_ALIAS``.
+    """
+    return caches[settings.CACHE_ALIAS]
+
+
+def _version_key(model):
+    return 'ajaxviews:version:' + model._meta.label_lower
+
+
+def get_model_version(model):
+    """
+    Get the current cache version of a model. Include it in cache keys of data that depends on the model's table,
+    so that entries are invalidated by :func:`bump_model_version`.
+
+    :param model: Django model class
+    :return: Version number
+    """
+    cache = get_cache()
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # start from a timestamp so an evicted version never revives stale entries
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_model_version(model):
+    """
+    Increment the cache version of a model, which invalidates all cache keys built with :func:`get_model_version`.
+
+    :param model: Django model class
+    """
+    cache = get_cache()
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), None)
+
+
+# noinspection PyUnusedLocal
+def _model_changed(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def watch_model(model):
+    """
+    Bump the cache version of a model whenever one of its instances is saved or deleted.
+
+    :param model: Django model class
+    """
+    dispatch_uid = 'ajaxviews:' + model._meta.label_lower
+    post_save.connect(_model_changed, sender=model, dispatch_uid=dispatch_uid)
+    post_delete.connect(_model_changed, sender=model, dispatch_uid=dispatch_uid)
+
+
+class LRUCache:
+    """
+    Bounded cache in process memory which discards the least recently used entry once ``maxsize`` entries are
+    stored.
+
+    :ivar int maxsize: Maximum number of entries.
+    :ivar int hits: Number of lookups that returned a cached value.
+    :ivar int misses: Number of lookups that had to compute the value.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_set(self, key, default):
+        """
+        Return the value cached for ``key`` or call ``default`` to compute and cache it.
+
+        :param key: Hashable key
+        :param default: Callable without arguments returning the value
+        :return: Cached value
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = default()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
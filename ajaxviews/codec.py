@@ -0,0 +1,130 @@
+import json
+
+from django.core.signals import setting_changed
+from django.core.serializers.json import DjangoJSONEncoder
+from django.dispatch import receiver
+
+from .conf import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def default(obj):
+    """
+    Serialize the types supported by Django's ``DjangoJSONEncoder``: dates, times, timedeltas, decimals,
+    UUIDs and lazy strings.
+
+    :param obj: Object the json backend isn't able to serialize
+    :return: JSON serializable representation of the object
+    """
+    return _django_encoder.default(obj)
+
+
+class JsonCodec:
+    """
+    Codec using python's built-in ``json`` module.
+    """
+    name = 'json'
+
+    # noinspection PyMethodMayBeStatic
+    def dumps(self, obj, sort_keys=False):
+        return json.dumps(obj, cls=DjangoJSONEncoder, sort_keys=sort_keys)
+
+    # noinspection PyMethodMayBeStatic
+    def loads(self, data):
+        return json.loads(data)
+
+
+class UJsonCodec(JsonCodec):
+    """
+    Codec using `ujson <https://github.com/ultrajson/ultrajson>`_ (>= 5.0). Decimals are serialized as floats
+    instead of strings, so it's only used if selected explicitly.
+    """
+    name = 'ujson'
+
+    def dumps(self, obj, sort_keys=False):
+        return ujson.dumps(obj, default=default, sort_keys=sort_keys)
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Codec using `orjson <https://github.com/ijl/orjson>`_. Datetime objects are passed to :func:`default`
+    to keep the format of ``DjangoJSONEncoder``.
+    """
+    name = 'orjson'
+
+    def dumps(self, obj, sort_keys=False):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option).decode('utf-8')
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+_codecs = {
+    'json': (JsonCodec, json),
+    'ujson': (UJsonCodec, ujson),
+    'orjson': (OrjsonCodec, orjson),
+}
+
+_codec_instance = None
+
+
+def get_codec():
+    """
+    Return the codec selected by the ``JSON_CODEC`` setting. With ``'auto'`` orjson is used if it's installed and
+    the built-in json module otherwise.
+
+    :return: Codec instance
+    """
+    global _codec_instance
+    if _codec_instance is None:
+        name = settings.JSON_CODEC
+        if name == 'auto':
+            name = 'orjson' if orjson is not None else 'json'
+        if name not in _codecs:
+            raise LookupError('JSON codec {} not supported!'.format(name))
+        codec_class, module = _codecs[name]
+        if module is None:
+            raise ImportError('JSON codec {} is not installed.'.format(name))
+        _codec_instance = codec_class()
+    return _codec_instance
+
+
+def dumps(obj, sort_keys=False):
+    """
+    Serialize ``obj`` to a JSON formatted string. Use ``sort_keys`` to get a canonical representation, e.g. to
+    build cache keys.
+    """
+    return get_codec().dumps(obj, sort_keys=sort_keys)
+
+
+def loads(data):
+    """
+    Deserialize a JSON formatted string or bytes to a python object.
+    """
+    return get_codec().loads(data)
+
+
+# noinspection PyUnusedLocal
+@receiver(setting_changed)
+def reset_codec(setting, **kwargs):
+    global _codec_instance
+    if setting == 'JSON_CODEC':
+        _codec_instance = None
@@ -0,0 +1,63 @@
+import datetime
+import re
+from calendar import timegm
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+_etag_re = re.compile(r'(?:W/)?"([^"]*)"')
+
+
+def get_timestamp(value):
+    """
+    :param value: Date or datetime
+    :return: Seconds since epoch or None
+    """
+    if value is None:
+        return None
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    return timegm(value.utctimetuple())
+
+
+def set_validators(response, etag=None, last_modified=None):
+    """
+    Add the ``ETag`` and ``Last-Modified`` headers to a successful response. The response may be stored by the
+    browser but has to be revalidated on every request.
+
+    :param response: Response object
+    :param str etag: Unquoted entity tag
+    :param last_modified: Date or datetime
+    :return: Response object
+    """
+    if response.status_code not in (200, 304) or (etag is None and last_modified is None):
+        return response
+    if etag is not None and not response.has_header('ETag'):
+        response['ETag'] = quote_etag(etag)
+    if last_modified is not None and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(get_timestamp(last_modified))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def get_not_modified_response(request, etag=None, last_modified=None):
+    """
+    Answer a conditional GET request with *304 Not Modified* if the validators match the request headers.
+    ``If-Modified-Since`` is ignored if the request contains ``If-None-Match``.
+
+    :param request: Request object
+    :param str etag: Unquoted entity tag of the response
+    :param last_modified: Date or datetime the response was last modified
+    :return: Response object or None if the response has to be rendered
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        if etag is None or (if_none_match.strip() != '*' and etag not in _etag_re.findall(if_none_match)):
+            return None
+    else:
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        timestamp = get_timestamp(last_modified)
+        if if_modified_since is None or timestamp is None or timestamp > if_modified_since:
+            return None
+    return set_validators(HttpResponseNotModified(), etag, last_modified)
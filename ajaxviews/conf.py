@@ -15,6 +15,14 @@ class LazySettings:
     def FILTER_SEARCH_INPUT_BY(self):
         return getattr(django_settings, 'FILTER_SEARCH_INPUT_BY', 10)
 
+    @property
+    def FILTER_PAGE_SIZE(self):
+        return getattr(django_settings, 'FILTER_PAGE_SIZE', 100)
+
+    @property
+    def LAZY_CHOICES_PAGE_SIZE(self):
+        return getattr(django_settings, 'LAZY_CHOICES_PAGE_SIZE', 100)
+
     @property
     def AUTO_PAGE_SIZE(self):
         return getattr(django_settings, 'AUTO_PAGE_SIZE', True)
@@ -51,4 +59,48 @@ class LazySettings:
     def AUTO_SUCCESS_URL(self):
         return getattr(django_settings, 'AUTO_SUCCESS_URL', True)
 
+    @property
+    def FORM_ACTIONS_CACHE_SIZE(self):
+        return getattr(django_settings, 'FORM_ACTIONS_CACHE_SIZE', 256)
+
+    @property
+    def JSON_CFG_MAX_SIZE(self):
+        return getattr(django_settings, 'JSON_CFG_MAX_SIZE', 16384)
+
+    @property
+    def JSON_CFG_MAX_DEPTH(self):
+        return getattr(django_settings, 'JSON_CFG_MAX_DEPTH', 8)
+
+    @property
+    def CACHE_ALIAS(self):
+        return getattr(django_settings, 'CACHE_ALIAS', 'default')
+
+    @property
+    def FILTER_CACHE_TIMEOUT(self):
+        return getattr(django_settings, 'FILTER_CACHE_TIMEOUT', 0)
+
+    @property
+    def COUNT_STRATEGY(self):
+        return getattr(django_settings, 'COUNT_STRATEGY', 'exact')
+
+    @property
+    def COUNT_CACHE_TIMEOUT(self):
+        return getattr(django_settings, 'COUNT_CACHE_TIMEOUT', 300)
+
+    @property
+    def COUNT_ESTIMATE_THRESHOLD(self):
+        return getattr(django_settings, 'COUNT_ESTIMATE_THRESHOLD', 10000)
+
+    @property
+    def JSON_CODEC(self):
+        return getattr(django_settings, 'JSON_CODEC', 'auto')
+
+    @property
+    def RESPONSE_CACHE_TIMEOUT(self):
+        return getattr(django_settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+    @property
+    def PREVIEW_TIMEOUT(self):
+        return getattr(django_settings, 'PREVIEW_TIMEOUT', 3600)
+
 settings = LazySettings()
@@ -1,4 +1,6 @@
-import json
+from collections import OrderedDict
+from copy import deepcopy
+from weakref import WeakKeyDictionary
 
 from django.core.urlresolvers import reverse, NoReverseMatch
 from django.contrib.admin.templatetags.admin_static import static
@@ -13,7 +15,35 @@ from crispy_forms.bootstrap import FormActions
 from crispy_forms.layout import LayoutObject, Layout, Submit, HTML
 from crispy_forms.utils import render_crispy_form, TEMPLATE_PACK
 
-from .helpers import init_chosen_widget, init_dateinput
+from . import codec
+from .cache import LRUCache
+from .conf import settings
+from .helpers import init_chosen_widget, init_dateinput, init_lazy_choices
+
+_form_actions_cache = None
+
+
+def get_form_actions_cache():
+    """
+    :return: :class:`ajaxviews.cache.LRUCache` of rendered form actions sized by ``FORM_ACTIONS_CACHE_SIZE``.
+    """
+    global _form_actions_cache
+    if _form_actions_cache is None:
+        _form_actions_cache = LRUCache(settings.FORM_ACTIONS_CACHE_SIZE)
+    return _form_actions_cache
+
+
+class _PreparedFields(OrderedDict):
+    # copy the fields only, which skips the generic deepcopy of the dictionary and its keys
+    def __deepcopy__(self, memo):
+        return OrderedDict((name, field.__deepcopy__(memo)) for name, field in self.items())
+
+
+def _shallow_copy(obj):
+    # faster than copy.copy for plain objects since it skips the pickle protocol
+    clone = obj.__class__.__new__(obj.__class__)
+    clone.__dict__.update(obj.__dict__)
+    return clone
 
 
 class DefaultFormActions(LayoutObject):
@@ -32,6 +62,7 @@ class DefaultFormActions(LayoutObject):
         popover if delete button is clicked.
     :ivar dict form_cfg: Additional data needed to process form save passed through a hidden input field. Dictionary
         is stringified and automatically parsed again when calling :func:`FormMixin.cleaned_form_cfg`.
+    :ivar bool cache_form_actions: Use the rendered form actions cached by these options. Default: ``True``
     """
     # noinspection PyUnusedLocal, PyMethodMayBeStatic
     def render(self, form, form_style, context, template_pack=TEMPLATE_PACK):
@@ -40,33 +71,75 @@ class DefaultFormActions(LayoutObject):
         if delete_url:
             delete_url += '&' if '?' in delete_url else '?'
             delete_url += 'success_url=' + force_text(form.opts.get('delete_success_url', success_url))
-        template = get_template(form.opts.get('form_actions_template', 'ajaxviews/_form_controls.html'))
-        btn_group = template.render({
+        template_context = {
             'delete_url': delete_url,
             'success_url': force_text(success_url),
             'modal_form': form.opts.get('modal_form', False),
             'form_preview': form.opts.get('preview_stage', False),
             'delete_confirmation': form.opts.get('delete_confirmation', False),
-            'form_cfg': json.dumps(form.form_cfg) if getattr(form, 'form_cfg', None) else None,
-        })
-        layout_object = FormActions(
-            Submit('save', form.opts.get('save_button_name', 'Save')),
-            HTML(btn_group),
-            style='margin-bottom: 0;'
-        )
-        return layout_object.render(form, form_style, context)
+            'form_cfg': codec.dumps(form.form_cfg) if getattr(form, 'form_cfg', None) else None,
+        }
+        template_name = form.opts.get('form_actions_template', 'ajaxviews/_form_controls.html')
+        save_button_name = force_text(form.opts.get('save_button_name', 'Save'))
+
+        def render_actions():
+            btn_group = get_template(template_name).render(template_context)
+            layout_object = FormActions(
+                Submit('save', save_button_name),
+                HTML(btn_group),
+                style='margin-bottom: 0;'
+            )
+            return layout_object.render(form, form_style, context)
+
+        cache = get_form_actions_cache()
+        if not cache.maxsize or not form.opts.get('cache_form_actions', True):
+            return render_actions()
+        key = (
+            template_name, save_button_name, template_pack, form_style,
+            context.get('label_class', None), context.get('field_class', None),
+        ) + tuple(template_context[name] for name in sorted(template_context))
+        return cache.get_or_set(key, render_actions)
 
 
 class DefaultFormHelper(FormHelper):
     """
     Crispy form helper used to define default form action control.
 
-    A ``data-async`` html property is added to the form tag.
+    A ``data-async`` html property is added to the form tag. A ``form_action`` containing a slash is used as url
+    without trying to reverse it.
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.attrs = {'data-async': ''}
 
+    @property
+    def form_action(self):
+        # a path can't be reversed, so don't try it each time the attributes are rendered
+        if '/' in self._form_action:
+            return self._form_action
+        return FormHelper.form_action.fget(self)
+
+    @form_action.setter
+    def form_action(self, action):
+        self._form_action = action
+
+    def clone(self, form=None):
+        """
+        Return a copy of the helper that can be changed without affecting this helper. The list of layout fields
+        is copied while the layout objects are shared.
+
+        :param form: Form instance to assign to the copy
+        :return: Form helper instance
+        """
+        helper = _shallow_copy(self)
+        helper.attrs = self.attrs.copy()
+        helper.inputs = list(self.inputs)
+        if self.layout is not None:
+            helper.layout = _shallow_copy(self.layout)
+            helper.layout.fields = list(self.layout.fields)
+        helper.form = form
+        return helper
+
     def append_form_actions(self):
         """
         Append form actions to the current layout.
@@ -102,7 +175,13 @@ class FormMixin:
         'init_date_widget',
         'delete_confirmation',
         'form_actions_template',
+        'cache_form_actions',
     ]
+    # form class mapped to field names and helpers with the static part of the layout
+    _helper_prototypes = WeakKeyDictionary()
+    # form class mapped to widget options and base fields with prepared widgets, classes built by formset
+    # factories are dropped with their last instance
+    _prepared_fields = WeakKeyDictionary()
 
     def __init__(self, *args, **kwargs):
         self._helper_instance = None
@@ -112,8 +191,39 @@ class FormMixin:
         for key in list(kwargs):
             if key in self.form_kwargs:
                 self.opts[key] = kwargs.pop(key)
+        # the form copies the prepared fields instead of the class' base fields
+        self.base_fields = self.get_prepared_fields(self.opts.get('init_chosen_widget', True),
+                                                    self.opts.get('init_date_widget', True))
         super().__init__(*args, **kwargs)
 
+    @classmethod
+    def get_prepared_fields(cls, chosen_widget=True, date_widget=True):
+        """
+        Apply :func:`ajaxviews.helpers.init_chosen_widget` and :func:`ajaxviews.helpers.init_dateinput` to a copy
+        of the form's base fields once per form class. Form instances get their fields by copying the prepared
+        fields, so the widgets aren't replaced on each instantiation.
+
+        Chosen widgets of the model choice fields listed in the meta's ``lazy_choice_fields`` render the selected
+        options only (see :func:`ajaxviews.helpers.init_lazy_choices`).
+
+        :param bool chosen_widget: Add the chosen widget class to select fields.
+        :param bool date_widget: Use :class:`ajaxviews.helpers.DateWidget` for date fields.
+        :return: Dictionary of field names and fields
+        """
+        key = (chosen_widget, date_widget)
+        prepared_fields = cls._prepared_fields.setdefault(cls, {})
+        fields = prepared_fields.get(key)
+        # prepare the fields again if base fields have been added or removed
+        if fields is None or fields.keys() != cls.base_fields.keys():
+            fields = _PreparedFields(deepcopy(cls.base_fields))
+            if chosen_widget:
+                init_lazy_choices(fields.items(), getattr(getattr(cls, 'Meta', None), 'lazy_choice_fields', ()))
+                init_chosen_widget(fields.items())
+            if date_widget:
+                init_dateinput(fields.items())
+            prepared_fields[key] = fields
+        return fields
+
     @property
     def helper(self):
         """
@@ -129,16 +239,14 @@ class FormMixin:
             return self._helper_instance
         if self.form_cfg:
             self.fields['form_cfg'] = CharField(widget=HiddenInput(), required=False)
-            self.fields['form_cfg'].initial = json.dumps(self.form_cfg)
+            self.fields['form_cfg'].initial = codec.dumps(self.form_cfg)
         try:
             self.init_add_fields()
         except AttributeError:
             pass
-        helper = DefaultFormHelper(self)
+        helper = self.get_helper_prototype(tuple(self.fields)).clone(self)
         if 'form_action' in self.opts:
             helper.form_action = self.opts['form_action']
-        helper.render_hidden_fields = True
-        helper.append_form_actions()
         self._helper_instance = helper
         return helper
 
@@ -146,6 +254,28 @@ class FormMixin:
     def helper(self, helper):
         self._helper_instance = helper
 
+    @classmethod
+    def get_helper_prototype(cls, field_names=None):
+        """
+        Build the default helper once per form class and field names. The :attr:`helper` property uses a clone of
+        it, so only request specific attributes need to be applied to each form instance.
+
+        :param tuple field_names: Names of the fields in the default layout. If None the helper renders the form
+            actions only.
+        :return: Form helper instance
+        """
+        helper_prototypes = cls._helper_prototypes.setdefault(cls, {})
+        if field_names not in helper_prototypes:
+            helper = DefaultFormHelper()
+            if field_names is None:
+                helper.add_form_actions_only()
+            else:
+                helper.add_layout(Layout(*field_names))
+                helper.render_hidden_fields = True
+                helper.append_form_actions()
+            helper_prototypes[field_names] = helper
+        return helper_prototypes[field_names]
+
     @property
     def cleaned_form_cfg(self):
         """
@@ -154,7 +284,7 @@ class FormMixin:
         :return: form cfg dictionary
         """
         if 'form_cfg' in self.cleaned_data:
-            return json.loads(self.cleaned_data['form_cfg'])
+            return codec.loads(self.cleaned_data['form_cfg'])
         return {}
 
     @property
@@ -186,15 +316,15 @@ class SimpleForm(FormMixin, Form):
 
         if success_message is not None:
             self.form_cfg['success_message'] = success_message
-        if self.opts.get('init_chosen_widget', True):
-            init_chosen_widget(self.fields.items())
-        if self.opts.get('init_date_widget', True):
-            init_dateinput(self.fields.items())
 
 
 class GenericModelForm(FormMixin, ModelForm):
     """
     Generic form for use with a corresponding model.
+
+    Add ``lazy_choice_fields`` to the form meta to load the options of large model choice fields on demand. It's
+    a list of field names or a dictionary of field names and lookups used to search the options, e.g.
+    ``{'customer': 'name__icontains'}``. Submitted values are still validated against the field's queryset.
     """
     field_label_addon = """<a class="modal-link form-add-link" href="{0}"><img src="{1}" alt="{2}"/></a>"""
 
@@ -208,11 +338,6 @@ class GenericModelForm(FormMixin, ModelForm):
                 self.fields[field_name].initial = value
                 del self.form_cfg['related_obj_ids'][key]
 
-        if self.opts.get('init_chosen_widget', True):
-            init_chosen_widget(self.fields.items())
-        if self.opts.get('init_date_widget', True):
-            init_dateinput(self.fields.items())
-
     def init_add_fields(self):
         for field_name, url_name in getattr(self.Meta, 'add_fields', {}).items():
             try:
@@ -228,8 +353,7 @@ class GenericModelForm(FormMixin, ModelForm):
     def render_form_actions(self):
         form = Form()
         form.opts = self.opts
-        form.helper = DefaultFormHelper(self)
-        form.helper.add_form_actions_only()
+        form.helper = self.get_helper_prototype().clone(self)
         return render_crispy_form(form)
 
     def get_related_obj(self, model, key=None):
@@ -4,10 +4,19 @@ except ImportError:
     pass
 
 try:
-    from guardian.shortcuts import assign_perm, remove_perm, get_perms_for_model, get_objects_for_user
+    from guardian.core import ObjectPermissionChecker
+    from guardian.shortcuts import get_perms_for_model, get_objects_for_user
+    from guardian.utils import get_user_obj_perms_model
 except ImportError:
     pass
 
+from copy import copy
+
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.core.exceptions import ValidationError
 from django.forms import Form, Select, SelectMultiple, DateInput
 from django.forms.widgets import DateTimeBaseInput
 
@@ -15,10 +24,47 @@ from crispy_forms.helper import FormHelper
 from crispy_forms.bootstrap import FieldWithButtons, StrictButton
 
 
+# model label and permission prefix mapped to the primary keys and codenames of matching permissions
+_model_perms = {}
+
+
+# noinspection PyUnusedLocal
+@receiver([post_save, post_delete], sender=Permission)
+@receiver([post_save, post_delete], sender=Group)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def reset_perm_cache(**kwargs):
+    _model_perms.clear()
+
+
+def _get_model_perms(model, perm_prefix):
+    """
+    Return the permissions of a model whose codename contains ``perm_prefix``. The result is cached per process
+    until a permission or group is changed.
+    """
+    key = (model._meta.label_lower, perm_prefix)
+    if key not in _model_perms:
+        _model_perms[key] = [(perm.pk, perm.codename) for perm in get_perms_for_model(model)
+                             if perm_prefix in perm.codename]
+    return _model_perms[key]
+
+
+def _get_user_cache(user):
+    """
+    Return a dictionary stored on the user instance to cache permission lookups. Since ``request.user`` is created
+    for each request, the cache lives as long as the request.
+    """
+    try:
+        return user._ajaxviews_perm_cache
+    except AttributeError:
+        user._ajaxviews_perm_cache = {}
+        return user._ajaxviews_perm_cache
+
+
 def get_objects_for_model(user, model, perm_prefix='access_'):
     """
     Shortcut to return objects of a model for an authenticated user with permissions.
-    This uses guardians ``get_objects_for_user`` function.
+    This uses guardians ``get_objects_for_user`` function. The QuerySet is built once per user instance and
+    returned as a copy on subsequent calls.
 
     >>> get_objects_for_model(request.user, ModelClass)
     <queryset>
@@ -30,42 +76,117 @@ def get_objects_for_model(user, model, perm_prefix='access_'):
     :param perm_prefix: Default: ``access_``
     :return: None if no permission else QuerySet
     """
-    package, __ = model.__module__.split('.')
-
-    for perm in get_perms_for_model(model):
-        if perm_prefix in perm.codename:
-            return get_objects_for_user(user, package + '.' + perm.codename)
-    return None
+    cache = _get_user_cache(user)
+    key = ('objects', model._meta.label_lower, perm_prefix)
+    if key not in cache:
+        package, __ = model.__module__.split('.')
+        perms = _get_model_perms(model, perm_prefix)
+        cache[key] = get_objects_for_user(user, package + '.' + perms[0][1]) if perms else None
+    return cache[key].all() if cache[key] is not None else None
 
 
 def get_model_perm(user, model, perm_prefix='access_'):
-    group_permissions = user.groups.first().permissions.all()
-    package, __ = model.__module__.split('.')
+    """
+    Return the permission of a model the first group of the user has been granted. The lookup is cached per user
+    instance.
 
-    for perm in get_perms_for_model(model):
-        if perm_prefix in perm.codename and perm in group_permissions:
-            return package + '.' + perm.codename
-    return None
+    :param user: Authenticated user
+    :param model: Django model class
+    :param perm_prefix: Default: ``access_``
+    :return: None if no permission else permission name with app label
+    """
+    perm = _get_group_model_perm(user, model, perm_prefix)
+    return perm[1] if perm else None
+
+
+def _get_group_model_perm(user, model, perm_prefix='access_'):
+    cache = _get_user_cache(user)
+    key = ('model_perm', model._meta.label_lower, perm_prefix)
+    if key not in cache:
+        if 'group_perms' not in cache:
+            group = user.groups.first()
+            cache['group_perms'] = set(group.permissions.values_list('pk', flat=True)) if group else set()
+        package, __ = model.__module__.split('.')
+        cache[key] = None
+        for pk, codename in _get_model_perms(model, perm_prefix):
+            if pk in cache['group_perms']:
+                cache[key] = (pk, package + '.' + codename)
+                break
+    return cache[key]
 
 
 def assign_obj_perm(user, obj):
-    permission = get_model_perm(user, obj.__class__)
-    if not permission:
-        raise PermissionError('No permissions to save object.')
-    if not user.has_perm(permission, obj):
-        assign_perm(permission, user, obj)
-        return True
-    return False
+    return bool(bulk_assign_obj_perm(user, [obj]))
 
 
 def remove_obj_perm(user, obj):
-    permission = get_model_perm(user, obj.__class__)
-    if not permission:
+    return bool(bulk_remove_obj_perm(user, [obj]))
+
+
+def bulk_assign_obj_perm(user, objects):
+    """
+    Assign the model permission of the user's group (see :func:`get_model_perm`) to the user for several objects
+    of the same model. The permission is resolved once, granted objects are looked up with one permission checker
+    and missing object permissions are inserted with ``bulk_create``.
+
+    :param user: Authenticated user
+    :param objects: Iterable of saved model instances
+    :return: List of objects the permission has been assigned to
+    """
+    objects = [obj for obj in objects if obj.pk is not None]
+    if not objects:
+        return []
+    model = objects[0].__class__
+    perm = _get_group_model_perm(user, model)
+    if not perm:
+        raise PermissionError('No permissions to save object.')
+    codename = perm[1].split('.')[-1]
+
+    checker = ObjectPermissionChecker(user)
+    checker.prefetch_perms(objects)
+    objects = [obj for obj in objects if not checker.has_perm(codename, obj)]
+
+    perm_model = get_user_obj_perms_model(model)
+    generic = perm_model.objects.is_generic()
+    ctype = ContentType.objects.get_for_model(model)
+    obj_perms = []
+    for obj in objects:
+        obj_perm = perm_model(permission_id=perm[0], user=user)
+        if generic:
+            obj_perm.content_type = ctype
+            obj_perm.object_pk = obj.pk
+        else:
+            obj_perm.content_object = obj
+        obj_perms.append(obj_perm)
+    perm_model.objects.bulk_create(obj_perms)
+    return objects
+
+
+def bulk_remove_obj_perm(user, objects):
+    """
+    Remove the model permission of the user's group for several objects of the same model with a single delete
+    query. Like guardian's bulk removal, no ``post_delete`` signals are sent for the object permissions.
+
+    :param user: Authenticated user
+    :param objects: Iterable of saved model instances
+    :return: Number of removed object permissions
+    """
+    objects = [obj for obj in objects if obj.pk is not None]
+    if not objects:
+        return 0
+    model = objects[0].__class__
+    perm = _get_group_model_perm(user, model)
+    if not perm:
         raise PermissionError('No permissions to remove object.')
-    if user.has_perm(permission, obj):
-        remove_perm(permission, user, obj)
-        return True
-    return False
+
+    perm_model = get_user_obj_perms_model(model)
+    obj_perms = perm_model.objects.filter(user=user, permission_id=perm[0])
+    if perm_model.objects.is_generic():
+        obj_perms = obj_perms.filter(content_type=ContentType.objects.get_for_model(model),
+                                     object_pk__in=[str(obj.pk) for obj in objects])
+    else:
+        obj_perms = obj_perms.filter(content_object__in=objects)
+    return obj_perms.delete()[0]
 
 
 class DateWidget(DateInput):
@@ -83,6 +204,69 @@ class DateWidget(DateInput):
                """.format(html_input)
 
 
+class LazyChoicesMixin:
+    """
+    Widget mixin for model choice fields which renders only the options of the selected values instead of
+    iterating the whole queryset. The remaining options are requested by the client side chosen widget.
+    """
+    def optgroups(self, name, value, attrs=None):
+        choices = self.choices
+        queryset = getattr(choices, 'queryset', None)
+        if queryset is not None:
+            self.choices = copy(choices)
+            self.choices.queryset = filter_selected_choices(choices.field, queryset, value)
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+
+class LazySelect(LazyChoicesMixin, Select):
+    pass
+
+
+class LazySelectMultiple(LazyChoicesMixin, SelectMultiple):
+    pass
+
+
+def filter_selected_choices(field, queryset, values):
+    """
+    Filter the queryset of a model choice field by the selected values.
+
+    :param field: Model choice field
+    :param queryset: Queryset of the field
+    :param values: List of selected values
+    :return: Filtered queryset
+    """
+    values = [value for value in values if value not in field.empty_values]
+    if not values:
+        return queryset.none()
+    key = field.to_field_name or 'pk'
+    try:
+        return queryset.filter(**{key + '__in': values})
+    except (ValueError, TypeError, ValidationError):
+        return queryset.none()
+
+
+def init_lazy_choices(field_items, field_names):
+    """
+    Assign :class:`LazySelect` or :class:`LazySelectMultiple` to model choice fields and add a
+    ``data-lazy-choices`` html attribute with the field name, so that their options are loaded on demand.
+
+    :param field_items: Django field items
+    :param field_names: Names of the fields to load lazily
+    """
+    for name, field in field_items:
+        if name not in field_names or not hasattr(field, 'queryset') or not isinstance(field.widget, Select):
+            continue
+        lazy_class = LazySelectMultiple if isinstance(field.widget, SelectMultiple) else LazySelect
+        widget = lazy_class(attrs=field.widget.attrs)
+        widget.is_required = field.widget.is_required
+        widget.choices = field.widget.choices
+        widget.attrs['data-lazy-choices'] = name
+        field.widget = widget
+
+
 def init_dateinput(field_items):
     """
     Assing the :class:`DateWidget` to all django fields which derive from :class:`DateTimeBaseInput` and
@@ -1,6 +1,9 @@
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.http import HttpResponseRedirect
-from django.utils.encoding import force_text
 from django.template.loader import get_template
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
 
 from .conf import settings
 
@@ -22,27 +25,117 @@ class AjaxMiddleware:
 
         {% load require %}
         {% require_module 'main' %}
+
+    The scripts are spliced into the encoded response body in front of the last ``</body>`` tag, so the content
+    is never decoded. Streaming responses with ``text/html`` content are wrapped in a generator that only holds back
+    the chunks following the last ``</body>`` tag seen so far. Other streaming responses like file downloads are
+    returned unchanged.
+
+    The ``_middleware.html`` template is rendered once per process with a placeholder in place of the json config.
+    Only the json config is interpolated per request. The cache is reset whenever a setting is changed.
     """
-    def process_response(self, request, response):
-        if not request.is_ajax() and not isinstance(response, HttpResponseRedirect) and hasattr(response, 'content'):
-            content = force_text(response.content, encoding=response.charset)
-            if '</body>' not in content:
-                return response
+    body_end_tag = b'</body>'
+    json_cfg_placeholder = '__ajaxviews_json_cfg__'
+    script_parts = None
 
-            json_cfg = {}
-            if hasattr(response, 'context_data'):
-                json_cfg = response.context_data.get('json_cfg', {})
+    def __init__(self):
+        self.get_script_parts()
 
+    @classmethod
+    def get_script_parts(cls):
+        """
+        Render the ``_middleware.html`` template with a placeholder for the json config if it hasn't been
+        rendered yet.
+
+        :return: List of static html parts to join with the json config
+        """
+        if cls.script_parts is None:
             template = get_template('ajaxviews/_middleware.html')
             html = template.render({
-                'json_cfg': json_cfg,
+                'json_cfg': mark_safe(cls.json_cfg_placeholder),
                 'main_name': settings.REQUIRE_MAIN_NAME,
             })
+            cls.script_parts = html.split(cls.json_cfg_placeholder)
+        return cls.script_parts
 
-            l_content, r_content = content.rsplit('</body>', 1)
-            content = ''.join([l_content, html, '</body>', r_content])
-
-            response.content = response.make_bytes(content)
+    def process_response(self, request, response):
+        if request.is_ajax() or isinstance(response, HttpResponseRedirect):
+            return response
+        if getattr(response, 'streaming', False):
+            if not response.get('Content-Type', '').startswith('text/html'):
+                return response
+            html = self.render_scripts(response)
+            response.streaming_content = self.inject_streaming_content(response.streaming_content, html)
+            if response.has_header('Content-Length'):
+                del response['Content-Length']
+        elif hasattr(response, 'content'):
+            content = response.content
+            index = content.rfind(self.body_end_tag)
+            if index < 0:
+                return response
+            html = self.render_scripts(response)
+            view = memoryview(content)
+            response.content = b''.join([view[:index], html, view[index:]])
             if response.get('Content-Length', None):
                 response['Content-Length'] = len(response.content)
         return response
+
+    # noinspection PyMethodMayBeStatic
+    def render_scripts(self, response):
+        """
+        Render the scripts to insert into the response body.
+
+        :param response: Response object
+        :return: Scripts encoded with the response charset
+        """
+        json_cfg = {}
+        if hasattr(response, 'context_data'):
+            json_cfg = response.context_data.get('json_cfg', {})
+        html = conditional_escape(json_cfg).join(self.get_script_parts())
+        return html.encode(response.charset)
+
+    def inject_streaming_content(self, streaming_content, html):
+        """
+        Insert ``html`` in front of the last ``</body>`` tag of a streamed body.
+
+        Content before the last tag seen so far is passed through as it arrives. Only the data following that tag,
+        plus a few bytes to detect a tag that's split between two chunks, is held back until the stream is
+        exhausted. If the body doesn't contain the tag it's returned unchanged.
+
+        :param streaming_content: Iterator of byte strings
+        :param bytes html: Encoded scripts to insert
+        """
+        tag = self.body_end_tag
+        keep = len(tag) - 1
+        carry = b''
+        held = None
+        for chunk in streaming_content:
+            if not chunk:
+                continue
+            data = carry + chunk
+            index = data.rfind(tag)
+            if index >= 0:
+                if held:
+                    yield b''.join(held)
+                if index:
+                    yield data[:index]
+                held = []
+                data = data[index:]
+            split = max(len(data) - keep, 0)
+            head, carry = data[:split], data[split:]
+            if head:
+                if held is None:
+                    yield head
+                else:
+                    held.append(head)
+        if held is not None:
+            yield html
+            yield b''.join(held)
+        if carry:
+            yield carry
+
+
+# noinspection PyUnusedLocal
+@receiver(setting_changed)
+def reset_script_parts(**kwargs):
+    AjaxMiddleware.script_parts = None
@@ -0,0 +1,196 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import SuspiciousOperation, ValidationError
+from django.core.paginator import Paginator, EmptyPage
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+
+from . import codec
+from .queries import get_path_field
+
+
+def exact_count(object_list):
+    """
+    Count the objects with ``COUNT(*)`` or ``len()`` if ``object_list`` is not a queryset.
+
+    :return: Tuple of the number of objects and False
+    """
+    try:
+        return object_list.count(), False
+    except (AttributeError, TypeError):
+        return len(object_list), False
+
+
+def estimated_count(queryset, threshold):
+    """
+    Use the row estimate of the PostgreSQL query planner instead of counting the objects. The exact count is
+    returned on other databases and if the estimate is below ``threshold``, since estimates of small or heavily
+    filtered result sets are too inaccurate.
+
+    :param queryset: QuerySet to count
+    :param int threshold: Minimum number of estimated rows to return the estimate
+    :return: Tuple of the number of objects and whether it's an estimate
+    """
+    if not hasattr(queryset, 'query') or connections[queryset.db].vendor != 'postgresql':
+        return exact_count(queryset)
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]['Plan']['Plan Rows'])
+    if estimate < threshold:
+        return exact_count(queryset)
+    return estimate, True
+
+
+class CountPaginator(Paginator):
+    """
+    Paginator which delegates counting the objects to ``counter``. If the count is approximate, page numbers beyond
+    the last page return an empty page instead of raising ``EmptyPage``.
+
+    :param counter: Callable taking the object list and returning a tuple of the count and whether it's approximate.
+        Default: :func:`exact_count`
+    :ivar bool approximate: Whether ``count`` is an estimate.
+    """
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, counter=None):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.counter = counter or exact_count
+        self.approximate = False
+
+    @cached_property
+    def count(self):
+        count, self.approximate = self.counter(self.object_list)
+        return count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.approximate and int(number) > 1:
+                return int(number)
+            raise
+
+
+class CursorPage:
+    """
+    A page of :class:`CursorPaginator`. Provides the attributes of Django's ``Page`` that don't depend on the total
+    number of objects.
+
+    :ivar list object_list: Objects of the page.
+    :ivar str next_cursor: Cursor to request the following page or None if this is the last page.
+    :ivar str previous_cursor: Cursor to request the preceding page or None if this is the first page.
+    """
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator which orders the queryset by ``field`` and the primary key. Pages are requested with an opaque
+    cursor holding the key of the first or last object of the previous page, so neither ``COUNT`` nor ``OFFSET``
+    queries are needed.
+
+    The field should not contain null values since they can't be compared with the cursor value.
+
+    :param queryset: QuerySet to paginate
+    :param int per_page: Number of objects per page
+    :param str field: Field path to order by. Default: ``'pk'``
+    :param bool descending: Order descending. Default: ``False``
+    """
+    value_name = 'ajaxviews_cursor_value'
+
+    def __init__(self, queryset, per_page, field='pk', descending=False):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.field = field
+        self.descending = descending
+
+    def encode_cursor(self, direction, obj):
+        value = getattr(obj, self.value_name) if self.field != 'pk' else None
+        # keep the microseconds which are cut off by DjangoJSONEncoder
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        data = codec.dumps([self.field, self.descending, direction, value, obj.pk])
+        return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, cursor):
+        """
+        :return: Tuple of direction, field value and primary key or None if the cursor belongs to another ordering.
+        """
+        try:
+            field, descending, direction, value, pk = codec.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (ValueError, TypeError, binascii.Error):
+            raise SuspiciousOperation('Invalid pagination cursor.')
+        if field != self.field or descending != self.descending or direction not in ('next', 'previous'):
+            return None
+        if self.field != 'pk':
+            try:
+                value = get_path_field(self.queryset.model, self.field).to_python(value)
+            except ValidationError:
+                raise SuspiciousOperation('Invalid pagination cursor.')
+        return direction, value, pk
+
+    def _order_and_filter(self, queryset, reverse, value, pk):
+        descending = self.descending != reverse
+        lookup = '__lt' if descending else '__gt'
+        prefix = '-' if descending else ''
+        if self.field == 'pk':
+            queryset = queryset.order_by(prefix + 'pk')
+            if pk is not None:
+                queryset = queryset.filter(**{'pk' + lookup: pk})
+            return queryset
+        queryset = queryset.annotate(**{self.value_name: F(self.field)}).order_by(prefix + self.field, prefix + 'pk')
+        if pk is not None:
+            queryset = queryset.filter(Q(**{self.field + lookup: value}) | Q(**{self.field: value, 'pk' + lookup: pk}))
+        return queryset
+
+    def page(self, cursor=None):
+        """
+        Return the page following (or preceding) the object encoded in ``cursor``. The first page is returned if
+        no cursor is given or if the cursor doesn't match the current ordering.
+
+        :param str cursor: Cursor of :class:`CursorPage`
+        :return: :class:`CursorPage`
+        """
+        key = self.decode_cursor(cursor) if cursor else None
+        direction, value, pk = key or ('next', None, None)
+        reverse = direction == 'previous'
+        queryset = self._order_and_filter(self.queryset, reverse, value, pk)
+
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if reverse:
+            object_list.reverse()
+        if not object_list:
+            return CursorPage(object_list, None, None)
+
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else pk is not None
+        return CursorPage(
+            object_list,
+            self.encode_cursor('next', object_list[-1]) if has_next else None,
+            self.encode_cursor('previous', object_list[0]) if has_previous else None,
+        )
@@ -1,63 +1,136 @@
 import datetime
-import json
+from collections import ChainMap
+from copy import copy
+from uuid import uuid4
 
 from django.contrib.auth.models import Group
-from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
 from django.core.urlresolvers import reverse
-from django.core.serializers.json import DjangoJSONEncoder
-from django.http import JsonResponse, QueryDict
+from django.core import signing
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render_to_response
+from django.template.loader import render_to_string
 from django.forms import CharField, HiddenInput
-from django.db.models import Min, Max
+from django.db.models import F, Min, Max, Count
 from django.utils.safestring import mark_safe
 from django.utils.encoding import force_text
+from django.utils.datastructures import MultiValueDict
+from django.utils.translation import get_language
 from django.contrib import messages
 
 from dateutil.parser import parse
-from crispy_forms.utils import render_crispy_form
 
+from . import codec
 from .conf import settings
-from .helpers import get_objects_for_model, construct_autocomplete_searchform, assign_obj_perm, remove_obj_perm
+from .cache import get_cache, get_model_version
+from .pagination import CursorPaginator, CountPaginator, exact_count, estimated_count
+from .schema import parse_json_cfg, get_json_cfg_key, presentation_fields
+from .helpers import get_objects_for_model, construct_autocomplete_searchform, assign_obj_perm, remove_obj_perm,\
+    bulk_assign_obj_perm, bulk_remove_obj_perm
+
+
+def _pass_through(*args, **kwargs):
+    if not kwargs and len(args) == 1:
+        return args[0]
+
+
+def _chain(name, controls):
+    """
+    Build a method that calls the functions of all controls defining ``name`` in order. A single positional
+    argument is passed from one control to the next and the chain stops if a control returns a falsy value.
+    """
+    def method(self, *args, **kwargs):
+        if not kwargs and len(args) == 1:
+            param = args[0]
+            for index, func in controls:
+                if param:
+                    param = func(self.controls[index], param)
+                    if not param:
+                        break
+                else:
+                    func(self.controls[index], *args)
+            return param
+        for index, func in controls:
+            func(self.controls[index], *args, **kwargs)
+    method.__name__ = name
+    return method
+
+
+def _first(name, index):
+    return property(lambda self: getattr(self.controls[index], name))
 
 
 class PluginAdapter:
+    """
+    Delegate attribute access of a plugin's ``extra`` to its extension plugins. Use :func:`for_controls` to get
+    an adapter class with a dispatch table for a combination of extension plugin classes. The table is built once
+    and maps public method names to the functions they chain and private names to the first control defining a
+    value or property. Names which none of the controls define return their argument or None.
+    """
+    __slots__ = ('controls',)
+    _classes = {}
+
     def __init__(self, controls):
         self.controls = controls
         # self.extra = None
 
+    @classmethod
+    def for_controls(cls, control_classes):
+        control_classes = tuple(control_classes)
+        if control_classes not in cls._classes:
+            table = {}
+            names = {name for control_class in control_classes for name in dir(control_class)
+                     if not name.startswith('__')}
+            for name in names:
+                attrs = [(index, getattr(control_class, name)) for index, control_class in enumerate(control_classes)
+                         if hasattr(control_class, name)]
+                if name.startswith('_'):
+                    index = next((index for index, attr in attrs if not callable(attr)), None)
+                    table[name] = _first(name, index) if index is not None else None
+                elif any(callable(attr) for index, attr in attrs):
+                    table[name] = _chain(name, [(index, attr) for index, attr in attrs if callable(attr)])
+            table['__slots__'] = ()
+            cls._classes[control_classes] = type(cls.__name__, (cls,), table)
+        return cls._classes[control_classes]
+
     def __getattr__(self, name):
         if name.startswith('_'):
-            for control_ in self.controls:
-                attr_ = getattr(control_, name, None)
-                if hasattr(control_, name) and not callable(attr_):
-                    return attr_
             return None
-
-        def wrapper(*args, **kwargs):
-            param = args[0] if not kwargs and len(args) == 1 else None
-            if not kwargs and len(args) == 1:
-                param = args[0]
-            for control in self.controls:
-                if hasattr(control, name):
-                    attr = getattr(control, name)
-                    if param:
-                        param = attr(param)
-                        if not param:
-                            break
-                    else:
-                        attr(*args, **kwargs)
-            if param is not None:
-                return param
-        return wrapper
+        return _pass_through
 
 
 class AjaxPlugin:
-    # noinspection PyUnusedLocal
-    def __init__(self, view, **kwargs):
+    """
+    Base plugin which processes the requests of a view. :class:`ajaxviews.views.ViewFactory` composes a subclass
+    per view class that holds the static configuration of the view, so that an instance only keeps the state of
+    a single request.
+
+    :var dict view_kwargs: Keyword arguments added to the view's init kwargs.
+    :var class adapter_class: Adapter class to dispatch calls to the extension plugins.
+    :var tuple extra_classes: Extension plugin classes instantiated for each request.
+    """
+    __slots__ = ('view', 'super', 'extra')
+    view_kwargs = {}
+    adapter_class = PluginAdapter
+    extra_classes = ()
+
+    def __init__(self, view, super_call=None):
         self.view = view
-        self.view_kwargs = {}
-        self.super = None
-        self.extra = None
+        self.super = super_call
+        self.extra = self.adapter_class([extra_class(self) for extra_class in self.extra_classes])
+
+    # noinspection PyUnusedLocal
+    @classmethod
+    def get_static_attrs(cls, view_class, **kwargs):
+        """
+        Compute the class attributes of the plugin composed for a view class. This is called once per view class
+        and init kwargs.
+
+        :param view_class: Class of the view using the plugin
+        :param kwargs: Init kwargs passed to ``as_view``
+        :return: Dictionary of class attributes
+        """
+        return {}
 
     @property
     def json_cfg(self):
@@ -67,6 +140,10 @@ class AjaxPlugin:
     def json_cfg(self, value):
         self.view.json_cfg = value
 
+    @property
+    def cfg(self):
+        return self.view.cfg
+
     @property
     def request(self):
         return self.view.request
@@ -75,9 +152,18 @@ class AjaxPlugin:
     def ajax_base_template(self):
         return getattr(self.view, 'ajax_base_template', 'ajaxviews/__ajax_base.html')
 
+    @property
+    def json_base_template(self):
+        return getattr(self.view, 'json_base_template', 'ajaxviews/__json_base.html')
+
+    @property
+    def json_response(self):
+        return bool(self.request.GET.get('json_response', False))
+
     def dispatch(self, request, *args, **kwargs):
-        json_cfg = kwargs.copy()
-        for key, value in json.loads(request.GET.dict().get('json_cfg', '{}')).items():
+        json_cfg = self.json_cfg
+        json_cfg.update(kwargs)
+        for key, value in parse_json_cfg(request.GET.get('json_cfg')).items():
             if value or value is False or value == 0:
                 json_cfg[key] = value
         if request.is_ajax():
@@ -85,20 +171,114 @@ class AjaxPlugin:
         if self.view.ajax_view:
             json_cfg['ajax_view'] = True
         json_cfg['view_name'] = request.resolver_match.url_name
-        self.json_cfg.update(json_cfg)
+        self.view.cfg = self.view.json_cfg_class(self.json_cfg)
 
     def get_context_data(self, context):
         context.update({
             'view_name': self.json_cfg.get('view_name', None),
-            'json_cfg': mark_safe(json.dumps(
-                self.json_cfg, cls=DjangoJSONEncoder
-            )),
+            'json_cfg': mark_safe(codec.dumps(self.json_cfg)),
             'page_size': getattr(self.view, 'page_size', None),
         })
         return context
 
+    def get_validators(self):
+        """
+        :return: Tuple of ETag and last modified date to answer conditional GET requests. None disables them.
+        """
+        return None, None
+
+    def get_request_key(self, **kwargs):
+        """
+        Build a hash of the normalized ``json_cfg``, the other query parameters, whether it's an ajax request and
+        ``kwargs``.
+        """
+        kwargs.update({
+            'json_cfg': self.json_cfg,
+            'params': sorted((key, value) for key, value in self.request.GET.items() if key != 'json_cfg'),
+            'ajax': self.request.is_ajax(),
+        })
+        return get_json_cfg_key(kwargs, exclude=())
+
+    def get_etag(self, *parts):
+        """
+        Build an ETag from the request key, the user and ``parts``.
+        """
+        return self.get_request_key(user=self.request.user.pk, parts=parts)
+
+    def get_response_cache_key(self):
+        """
+        Build the cache key of the response from the request key, the values of ``response_cache_vary`` and the
+        cache versions of the models the response depends on.
+        """
+        vary = {}
+        for name in self.view.response_cache_vary:
+            if name == 'user':
+                vary['user'] = self.request.user.pk
+            elif name == 'group':
+                vary['group'] = sorted(self.request.user.groups.values_list('pk', flat=True))
+            elif name == 'language':
+                vary['language'] = get_language()
+        if getattr(self.view, 'filter_user', False):
+            vary['user'] = self.request.user.pk
+        models = (getattr(self.view, 'model', None),) + self.view.response_cache_models
+        view_class = self.view.__class__
+        return 'ajaxviews:response:{}.{}:{}:{}'.format(
+            view_class.__module__, view_class.__name__, self.get_request_key(vary=vary),
+            '.'.join(str(get_model_version(model)) for model in models if model is not None),
+        )
+
+    def get_cached_response(self, render):
+        """
+        Return the cached response if the view's ``response_cache_timeout`` is set. Otherwise call ``render`` and
+        cache the response once it's rendered.
+
+        :param render: Function returning the response of the view
+        """
+        timeout = self.view.response_cache_timeout
+        if not timeout:
+            return render()
+        cache = get_cache()
+        cache_key = self.get_response_cache_key()
+        data = cache.get(cache_key)
+        if data is not None:
+            content, content_type, json_cfg = data
+            response = HttpResponse(content, content_type=content_type)
+            if json_cfg is not None:
+                # the ajax middleware inserts the json config script from the context data
+                response.context_data = {'json_cfg': mark_safe(json_cfg)}
+            return response
+
+        def store(rendered):
+            if rendered.cookies or self.request.META.get('CSRF_COOKIE_USED', False):
+                return
+            json_cfg = (getattr(rendered, 'context_data', None) or {}).get('json_cfg', None)
+            json_cfg = str(json_cfg) if json_cfg is not None else None
+            cache.set(cache_key, (rendered.content, rendered['Content-Type'], json_cfg), timeout)
+
+        response = render()
+        if response.status_code != 200 or getattr(response, 'streaming', False):
+            return response
+        if getattr(response, 'is_rendered', True):
+            store(response)
+        else:
+            response.add_post_render_callback(store)
+        return response
+
+    def get_json_response_data(self, context):
+        """
+        Data of the response if ``json_response`` is requested. Only the ``main_content`` block of the view's
+        template is rendered, so that the client doesn't have to parse a full page to update the view.
+
+        :return: Dictionary with ``json_cfg`` and the rendered ``html`` fragment.
+        """
+        context['generic_template'] = self.json_base_template
+        html = render_to_string(self.view.get_template_names(), context, request=self.request)
+        return {'json_cfg': self.json_cfg, 'html': html.strip()}
+
 
 class ListPlugin(AjaxPlugin):
+    __slots__ = ()
+
     @property
     def paginate_by(self):
         return self.view.paginate_by if self.view.paginate_by else settings.DEFAULT_PAGINATE_BY
@@ -115,34 +295,87 @@ class ListPlugin(AjaxPlugin):
     def filter_search_input_by(self):
         return getattr(self.view, 'filter_search_input_by', settings.FILTER_SEARCH_INPUT_BY)
 
+    @property
+    def cursor_pagination(self):
+        return getattr(self.view, 'cursor_pagination', False)
+
+    @property
+    def filter_page_size(self):
+        return getattr(self.view, 'filter_page_size', settings.FILTER_PAGE_SIZE)
+
+    @property
+    def filter_cache_timeout(self):
+        return getattr(self.view, 'filter_cache_timeout', settings.FILTER_CACHE_TIMEOUT)
+
+    @property
+    def prefetch_facets(self):
+        return getattr(self.view, 'prefetch_facets', False)
+
+    @property
+    def count_strategy(self):
+        return getattr(self.view, 'count_strategy', settings.COUNT_STRATEGY)
+
+    @property
+    def count_cache_timeout(self):
+        return getattr(self.view, 'count_cache_timeout', settings.COUNT_CACHE_TIMEOUT)
+
+    @property
+    def count_estimate_threshold(self):
+        return getattr(self.view, 'count_estimate_threshold', settings.COUNT_ESTIMATE_THRESHOLD)
+
     def dispatch(self, request, *args, **kwargs):
         super().dispatch(request, *args, **kwargs)
         self.json_cfg['init_view_type'] = 'listView'
-        if 'ajax_page_nr' in self.json_cfg:
-            self.view.kwargs['page'] = self.json_cfg['ajax_page_nr']
+        selected_filters = [[index, values] for index, values in self.cfg.selected_filters if values]
+        if self.cfg.selected_filter_index >= 0 and self.cfg.selected_filter_values:
+            selected_filters = [item for item in selected_filters if item[0] != self.cfg.selected_filter_index]
+            selected_filters.append([self.cfg.selected_filter_index, self.cfg.selected_filter_values])
+        indexes = [self.cfg.filter_index, self.cfg.sort_index] + [index for index, values in selected_filters]
+        for index in indexes:
+            if index >= len(self.filter_fields):
+                raise SuspiciousOperation('Filter index {} out of range.'.format(index))
+        for index, values in selected_filters:
+            filter_field = self.filter_fields[index]
+            is_date = isinstance(filter_field, tuple) and len(filter_field) == 2 and filter_field[1] == 'date'
+            if is_date != isinstance(values, dict):
+                raise SuspiciousOperation('Invalid values for filter index {}.'.format(index))
+        # the client only keeps track of the list of selected filters
+        self.cfg.selected_filters = self.json_cfg['selected_filters'] = selected_filters
+        self.json_cfg.pop('selected_filter_index', None)
+        self.json_cfg.pop('selected_filter_values', None)
+        if self.cfg.ajax_page_nr is not None:
+            self.view.kwargs['page'] = self.cfg.ajax_page_nr
+        if self.prefetch_facets:
+            self.json_cfg['prefetch_facets'] = True
+
+    def get_validators(self):
+        """
+        The validators are the latest value of ``last_modified_field`` and the number of objects of the filtered
+        queryset, or of all objects for filter popovers.
+        """
+        field = getattr(self.view, 'last_modified_field', None)
+        if not field:
+            return None, None
+        if self.cfg.facets or self.cfg.filter_index >= 0:
+            queryset = self._get_queryset_all()
+        else:
+            queryset = self.view.get_queryset()
+        data = queryset.order_by().aggregate(last_modified=Max(field), count=Count('pk'))
+        return self.get_etag(data['last_modified'], data['count']), data['last_modified']
 
     # noinspection PyUnusedLocal
     def get(self, request, *args, **kwargs):
-        if self.json_cfg.get('filter_index', -1) >= 0:
-            filter_field = self.filter_fields[int(self.json_cfg['filter_index'])]
-            if isinstance(filter_field, str):
-                filter_values = self._get_queryset_all().get_unique_values(filter_field)
-                values_list = []
-                for value in filter_values:
-                    if value:
-                        values_list.append((value, value))
-                return self._multiple_filter_response(values_list)
-            elif isinstance(filter_field, tuple):
-                if len(filter_field) == 2 and filter_field[1] == 'date':
-                    return self._date_filter_response(filter_field[0])
-                elif len(filter_field) == 3 and (filter_field[1] == 'dict' or filter_field[1] == 'set'):
-                    filter_values = self._get_queryset_all().get_unique_values(filter_field[0])
-                    values_list = [(value, dict(filter_field[2])[value]) for value in filter_values if value]
-                    return self._multiple_filter_response(values_list)
-                else:
-                    raise LookupError('Invalid filter set!')
-            else:
-                raise LookupError('Invalid filter field!')
+        if self.cfg.facets:
+            return JsonResponse({'facets': self._get_filter_values(self._get_facets, None, filter_index='facets')})
+        if self.cfg.filter_index >= 0:
+            filter_field = self.filter_fields[self.cfg.filter_index]
+            if isinstance(filter_field, tuple) and len(filter_field) == 2 and filter_field[1] == 'date':
+                min_date, max_date = self._get_filter_values(self._get_date_range, filter_field[0])
+                return self._date_filter_response(min_date, max_date)
+            if isinstance(filter_field, tuple) and len(filter_field) >= 2 and filter_field[1] == 'search':
+                return self._search_filter_response(filter_field)
+            values_list = self._get_filter_values(self._get_values_list, filter_field)
+            return self._multiple_filter_response(values_list)
 
     def get_queryset(self, **kwargs):
         if getattr(self.view, 'filter_user', False):
@@ -150,24 +383,77 @@ class ListPlugin(AjaxPlugin):
         else:
             queryset = self.super.get_queryset()
         if hasattr(queryset, 'default_filter'):
-            opts = self.json_cfg.copy()
+            # derive the filter options from json_cfg without copying it
+            opts = ChainMap({}, self.json_cfg)
             if hasattr(self, 'filter_fields'):
-                if self.json_cfg.get('selected_filter_index', -1) >= 0:
-                    opts['filter_field'] = self.filter_fields[int(self.json_cfg['selected_filter_index'])]
-                if self.json_cfg.get('sort_index', -1) >= 0:
-                    opts['sort_field'] = self.filter_fields[int(self.json_cfg['sort_index'])]
+                opts['filters'] = self._get_selected_filters()
+                if self.cfg.sort_index >= 0:
+                    opts['sort_field'] = self.filter_fields[self.cfg.sort_index]
             return queryset.default_filter(opts, **kwargs)
         return queryset
 
+    def paginate_queryset(self, queryset, page_size):
+        if not self.cursor_pagination:
+            return self.super.paginate_queryset(queryset, page_size)
+        field, descending = 'pk', False
+        if self.cfg.sort_index >= 0:
+            sort_field = self.filter_fields[self.cfg.sort_index]
+            if not (isinstance(sort_field, tuple) and len(sort_field) == 2 and
+                    (sort_field[1] == 'exclude' or sort_field[1] == 'exclude_sort')):
+                field = sort_field if isinstance(sort_field, str) else sort_field[0]
+                descending = self.cfg.sort_order != 'asc'
+        paginator = CursorPaginator(queryset, page_size, field, descending)
+        page = paginator.page(self.cfg.cursor)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    # noinspection PyUnusedLocal
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        return CountPaginator(queryset, per_page, orphans, allow_empty_first_page, counter=self.count_objects)
+
+    def count_objects(self, queryset):
+        """
+        Count the objects of the filtered queryset with the view's ``count_strategy``.
+
+        :return: Tuple of the number of objects and whether it's approximate
+        """
+        if self.count_strategy == 'exact':
+            return exact_count(queryset)
+        if self.count_strategy == 'estimate':
+            return estimated_count(queryset, self.count_estimate_threshold)
+        if self.count_strategy == 'cached':
+            return self._get_cached_count(queryset)
+        raise ImproperlyConfigured('Count strategy {} not supported!'.format(self.count_strategy))
+
+    def _get_cached_count(self, queryset):
+        """
+        Cache the exact count per view, filter and sort options, url arguments and user (if ``filter_user``), so
+        that flipping pages doesn't count the objects again. The cache is invalidated when an instance of the view's
+        model is saved or deleted.
+        """
+        view_class = self.view.__class__
+        cache_key = 'ajaxviews:count:{}.{}:{}:{}:{}'.format(
+            view_class.__module__, view_class.__name__,
+            get_json_cfg_key(self.json_cfg, exclude=presentation_fields + (self.view.page_kwarg,)),
+            self.request.user.pk if self.filter_user else 'all', get_model_version(self.view.model),
+        )
+        cache = get_cache()
+        count = cache.get(cache_key)
+        if count is None:
+            count = exact_count(queryset)[0]
+            cache.set(cache_key, count, self.count_cache_timeout)
+        return count, False
+
     def get_context_data(self, context):
         context = super().get_context_data(context)
+        context['cursor_pagination'] = self.cursor_pagination
+        context['count_approximate'] = getattr(context.get('paginator'), 'approximate', False)
         if self.request.is_ajax() and not self.request.GET.get('modal_id', False):
             context['generic_template'] = self.ajax_base_template
         if not self.request.is_ajax() and hasattr(self.view, 'search_field'):
             context['search_form'] = construct_autocomplete_searchform(self.view.search_field)
-        if self.json_cfg.get('sort_index', -1) >= 0:
-            context['sort_index'] = self.json_cfg['sort_index']
-            context['sort_order'] = self.json_cfg.get('sort_order', None)
+        if self.cfg.sort_index >= 0:
+            context['sort_index'] = self.cfg.sort_index
+            context['sort_order'] = self.cfg.sort_order
         return context
 
     def _get_queryset_all(self):
@@ -175,45 +461,191 @@ class ListPlugin(AjaxPlugin):
             return get_objects_for_model(self.request.user, self.view.model)
         return self.view.model.objects.all()
 
-    def _multiple_filter_response(self, values_list):
-        selected_values = []
-        if not self.json_cfg.get('ignore_selected_values', False):
-            selected_values = self.json_cfg.get('selected_filter_values', [])
-        return render_to_response('ajaxviews/_select_multiple_filter.html', {
-            'values_list': values_list,
-            'selected_values': selected_values,
-            'reset_button': True if selected_values else False,
-            'search_input': True if len(values_list) > self.filter_search_input_by else False
-        })
+    def _get_selected_filters(self, exclude_index=None):
+        return [(self.filter_fields[index], values) for index, values in self.cfg.selected_filters
+                if index != exclude_index]
+
+    def _get_facet_queryset(self, filter_index=None):
+        """
+        Return the objects the values of the requested ``filter_index`` are looked up in. These are narrowed down by
+        all other selected filters, so that only values which return results are displayed.
+        """
+        queryset = self._get_queryset_all()
+        filter_index = self.cfg.filter_index if filter_index is None else filter_index
+        filters = self._get_selected_filters(exclude_index=filter_index)
+        if filters and hasattr(queryset, 'ajax_filter'):
+            queryset = queryset.ajax_filter({'filters': filters})
+        return queryset
 
-    def _date_filter_response(self, field):
-        query_dict = self._get_queryset_all().aggregate(Min(field), Max(field))
+    def _get_filter_values(self, func, filter_field, filter_index=None):
+        """
+        Return the values displayed in the filter popover of the requested ``filter_index``. If
+        ``filter_cache_timeout`` is set, the values are cached per view, filter index and user (if ``filter_user``)
+        until the timeout expires or an instance of the view's model is saved or deleted.
+        """
+        if not self.filter_cache_timeout:
+            return func(filter_field)
+        view_class = self.view.__class__
+        filter_index = self.cfg.filter_index if filter_index is None else filter_index
+        other_filters = [item for item in self.cfg.selected_filters if item[0] != filter_index]
+        cache_key = 'ajaxviews:filter:{}.{}:{}:{}:{}:{}'.format(
+            view_class.__module__, view_class.__name__, filter_index,
+            get_json_cfg_key({'selected_filters': other_filters}, exclude=()),
+            self.request.user.pk if self.filter_user else 'all', get_model_version(self.view.model),
+        )
+        cache = get_cache()
+        values = cache.get(cache_key)
+        if values is None:
+            values = func(filter_field)
+            cache.set(cache_key, values, self.filter_cache_timeout)
+        return values
+
+    def _get_values_list(self, filter_field):
+        if isinstance(filter_field, str):
+            filter_values = self._get_facet_queryset().get_unique_values(filter_field)
+            return [(value, value) for value in filter_values if value]
+        elif isinstance(filter_field, tuple):
+            if len(filter_field) == 3 and (filter_field[1] == 'dict' or filter_field[1] == 'set'):
+                filter_values = self._get_facet_queryset().get_unique_values(filter_field[0])
+                return [(value, dict(filter_field[2])[value]) for value in filter_values if value]
+            raise LookupError('Invalid filter set!')
+        raise LookupError('Invalid filter field!')
+
+    def _get_date_range(self, field, filter_index=None):
+        query_dict = self._get_facet_queryset(filter_index).aggregate(Min(field), Max(field))
         min_date = query_dict[field + '__min']
         max_date = query_dict[field + '__max']
         if isinstance(min_date, datetime.datetime):
             min_date = min_date.date()
         if isinstance(max_date, datetime.datetime):
             max_date = max_date.date()
+        return min_date, max_date
+
+    def _get_selected_values(self, filter_index=None):
+        if self.cfg.ignore_selected_values:
+            return []
+        filter_index = self.cfg.filter_index if filter_index is None else filter_index
+        for index, values in self.cfg.selected_filters:
+            if index == filter_index:
+                return values
+        return []
+
+    # noinspection PyUnusedLocal
+    def _get_facets(self, filter_field):
+        """
+        Collect the values with object counts and the rendered filter popover of all ``filter_fields`` for the
+        current filter state. The values of all fields are counted in one query, date ranges are looked up with one
+        aggregate query per date field. Fields with ``search`` or ``exclude`` options are skipped.
+        """
+        facets = {}
+        value_facets = []
+        for index, filter_field in enumerate(self.filter_fields):
+            if isinstance(filter_field, tuple) and len(filter_field) >= 2 and \
+               filter_field[1] in ('exclude', 'exclude_filter', 'search'):
+                continue
+            if isinstance(filter_field, tuple) and len(filter_field) == 2 and filter_field[1] == 'date':
+                min_date, max_date = self._get_date_range(filter_field[0], index)
+                context = self._date_filter_context(min_date, max_date, self._get_selected_values(index))
+                facets[index] = {
+                    'min_date': min_date,
+                    'max_date': max_date,
+                    'html': render_to_string('ajaxviews/_select_date_filter.html', context),
+                }
+                continue
+            field = filter_field if isinstance(filter_field, str) else filter_field[0]
+            value_facets.append((index, field, self._get_selected_filters(exclude_index=index)))
+
+        queryset = self._get_queryset_all()
+        if value_facets and not hasattr(queryset, 'get_facet_counts'):
+            raise ImproperlyConfigured('Facets require the AjaxQuerySet as manager of {}.'.format(self.view.model))
+        counts = queryset.get_facet_counts(value_facets) if value_facets else {}
+        for index, values in counts.items():
+            filter_field = self.filter_fields[index]
+            display = dict(filter_field[2]) if isinstance(filter_field, tuple) and len(filter_field) > 2 else {}
+            values = [(value, display.get(value, value), count) for value, count in values if value]
+            context = self._multiple_filter_context([item[:2] for item in values], self._get_selected_values(index))
+            facets[index] = {
+                'values': values,
+                'html': render_to_string('ajaxviews/_select_multiple_filter.html', context),
+            }
+        return facets
+
+    def _search_filter_response(self, filter_field):
+        """
+        Render one page of the distinct values of a ``('<field_path>', 'search')`` filter field. The values are
+        looked up with ``filter_search`` using the lookup given as third tuple element (default: ``icontains``).
+        Selected values are always listed at the top of the first page.
+        """
+        field = filter_field[0]
+        lookup = filter_field[2] if len(filter_field) > 2 else 'icontains'
+        selected_values = self._get_selected_values()
+        page_size = self.filter_page_size
+        page = self.cfg.filter_page
+
+        # lookups on the annotation apply to the joined value and not to the objects of multi-valued relations
+        queryset = self._get_facet_queryset().annotate(_filter_value=F(field))
+        if self.cfg.filter_search:
+            queryset = queryset.filter(**{'_filter_value__' + lookup: self.cfg.filter_search})
+        if selected_values:
+            queryset = queryset.exclude(_filter_value__in=selected_values)
+        offset = (page - 1) * page_size
+        filter_values = list(queryset.get_unique_values(field)[offset:offset + page_size + 1])
+
+        values_list = [(value, value) for value in filter_values[:page_size] if value]
+        if page == 1:
+            values_list = [(value, value) for value in selected_values] + values_list
+        context = {
+            'values_list': values_list,
+            'selected_values': selected_values,
+            'server_search': True,
+            'next_page': page + 1 if len(filter_values) > page_size else None,
+        }
+        if self.cfg.filter_values_only:
+            return render_to_response('ajaxviews/_filter_values.html', context)
+        context.update({
+            'reset_button': True if selected_values else False,
+            'search_input': bool(context['next_page'] or len(values_list) > self.filter_search_input_by),
+        })
+        return render_to_response('ajaxviews/_select_multiple_filter.html', context)
 
-        selected_dates = self.json_cfg.get('selected_filter_values', None)
-        if selected_dates and not self.json_cfg.get('ignore_selected_values', False):
-            selected_min_date = parse(selected_dates['min_date']).date()
-            selected_max_date = parse(selected_dates['max_date']).date()
+    def _multiple_filter_response(self, values_list):
+        context = self._multiple_filter_context(values_list, self._get_selected_values())
+        return render_to_response('ajaxviews/_select_multiple_filter.html', context)
+
+    def _multiple_filter_context(self, values_list, selected_values):
+        return {
+            'values_list': values_list,
+            'selected_values': selected_values,
+            'reset_button': True if selected_values else False,
+            'search_input': True if len(values_list) > self.filter_search_input_by else False
+        }
+
+    def _date_filter_response(self, min_date, max_date):
+        context = self._date_filter_context(min_date, max_date, self._get_selected_values())
+        return render_to_response('ajaxviews/_select_date_filter.html', context)
+
+    # noinspection PyMethodMayBeStatic
+    def _date_filter_context(self, min_date, max_date, selected_dates):
+        if selected_dates:
+            selected_min_date = parse(selected_dates['min_date']).date() if selected_dates['min_date'] else min_date
+            selected_max_date = parse(selected_dates['max_date']).date() if selected_dates['max_date'] else max_date
             reset_button = True
         else:
             selected_min_date = min_date
             selected_max_date = max_date
             reset_button = False
-        return render_to_response('ajaxviews/_select_date_filter.html', {
+        return {
             'min_date': min_date,
             'max_date': max_date,
             'selected_min_date': selected_min_date,
             'selected_max_date': selected_max_date,
             'reset_button': reset_button,
-        })
+        }
 
 
 class ModalPlugin(AjaxPlugin):
+    __slots__ = ('modal_id',)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.modal_id = None
@@ -224,9 +656,7 @@ class ModalPlugin(AjaxPlugin):
 
     def dispatch(self, request, *args, **kwargs):
         super().dispatch(request, *args, **kwargs)
-        self.modal_id = request.GET.get('modal_id', '').replace('#', '')
-        if not self.modal_id:
-            self.modal_id = self.json_cfg.get('modal_id', '').replace('#', '')
+        self.modal_id = request.GET.get('modal_id', '').replace('#', '') or self.cfg.modal_id
 
     def get_context_data(self, context):
         context = super().get_context_data(context)
@@ -237,14 +667,32 @@ class ModalPlugin(AjaxPlugin):
             })
         return context
 
+    def get_json_response_data(self, context):
+        # the modal is rendered without config script to be inserted as is
+        if self.modal_id and self.request.method == 'GET':
+            context['json_response'] = True
+            html = render_to_string(self.view.get_template_names(), context, request=self.request)
+            return {'json_cfg': self.json_cfg, 'html': html.strip()}
+        return super().get_json_response_data(context)
+
 
 class DetailPlugin(ModalPlugin):
+    __slots__ = ()
+
     def dispatch(self, request, *args, **kwargs):
         super().dispatch(request, *args, **kwargs)
         self.json_cfg['init_view_type'] = 'detailView'
         if self.modal_id and not hasattr(self.view, 'form_class'):
             self.json_cfg['full_url'] = self.request.get_full_path()
 
+    def get_validators(self):
+        field = getattr(self.view, 'last_modified_field', None)
+        if not field:
+            return None, None
+        obj = self.view.get_object(self.view.get_queryset().only(field))
+        last_modified = getattr(obj, field)
+        return self.get_etag(obj.pk, last_modified), last_modified
+
     def get_queryset(self, **kwargs):
         """
         If using django-safedelete, objects that were marked as deleted will not be displayed.
@@ -268,8 +716,22 @@ class DetailPlugin(ModalPlugin):
         return context
 
 
+class ExtraPlugin:
+    """
+    Base class of extension plugins which are called through the ``extra`` adapter of a plugin.
+    """
+    __slots__ = ('plugin', 'view', 'super')
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.view = plugin.view
+        self.super = plugin.super
+
+
 # noinspection PyUnresolvedReferences, PyUnusedLocal
-class CreateForm:
+class CreateForm(ExtraPlugin):
+    __slots__ = ()
+
     @property
     def _headline_prefix(self):
         return getattr(self.view, 'headline_prefix', settings.CREATE_FORM_HEADLINE_PREFIX)
@@ -290,15 +752,11 @@ class CreateForm:
             instance = form.save()
             assign_obj_perm(self.view.request.user, instance)
 
-    def formset_valid(self, formset):
-        if getattr(formset.Meta, 'assign_perm', False):
-            # TODO this needs to be done also for updating formsets (remove/assign)
-            for obj in self.view.object_list:
-                assign_obj_perm(self.request.user, obj)
-
 
 # noinspection PyUnresolvedReferences, PyUnusedLocal
-class UpdateForm:
+class UpdateForm(ExtraPlugin):
+    __slots__ = ()
+
     @property
     def _headline_prefix(self):
         return getattr(self.view, 'headline_prefix', settings.UPDATE_FORM_HEADLINE_PREFIX)
@@ -324,15 +782,28 @@ class UpdateForm:
 
 # noinspection PyCallingNonCallable, PyUnresolvedReferences
 class FormPlugin(ModalPlugin):
+    __slots__ = ('form_cfg',)
+    static_form_meta = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.form_cfg = {}
-        form_class = kwargs.get('form_class') or getattr(self.view, 'form_class', None)
+
+    @classmethod
+    def get_static_attrs(cls, view_class, **kwargs):
+        attrs = super().get_static_attrs(view_class, **kwargs)
+        form_class = kwargs.get('form_class') or getattr(view_class, 'form_class', None)
         if form_class:
+            view_kwargs = {}
             if 'model' not in kwargs and hasattr(form_class.Meta, 'model'):
-                self.view_kwargs['model'] = getattr(form_class.Meta, 'model')
+                view_kwargs['model'] = getattr(form_class.Meta, 'model')
             if hasattr(form_class.Meta, 'success_message'):
-                self.view_kwargs['success_message'] = getattr(form_class.Meta, 'success_message')
+                view_kwargs['success_message'] = getattr(form_class.Meta, 'success_message')
+            attrs['view_kwargs'] = view_kwargs
+            # the form class can only be resolved statically if get_form_class isn't customized
+            if view_class.get_form_class.__module__ in ('django.views.generic.edit', 'ajaxviews.views'):
+                attrs['static_form_meta'] = getattr(form_class, 'Meta', None)
+        return attrs
 
     @property
     def related_object_ids(self):
@@ -340,16 +811,52 @@ class FormPlugin(ModalPlugin):
 
     @property
     def form_meta(self):
+        if self.static_form_meta is not None:
+            return self.static_form_meta
         return getattr(self.view.get_form_class(), 'Meta', None)
 
     def dispatch(self, request, *args, **kwargs):
         super().dispatch(request, *args, **kwargs)
         self.json_cfg['init_view_type'] = 'formView'
 
+    def get(self, request, *args, **kwargs):
+        if self.cfg.lazy_choices:
+            return self._lazy_choices_response(self.cfg.lazy_choices)
+
+    def _lazy_choices_response(self, field_name):
+        """
+        Return a page of options of a model choice field listed in the form meta's ``lazy_choice_fields``. The
+        form is instantiated to respect querysets limited in the form's ``__init__``.
+        """
+        lazy_fields = getattr(self.form_meta, 'lazy_choice_fields', ())
+        if field_name not in lazy_fields:
+            raise SuspiciousOperation('Field {} has no lazy choices.'.format(field_name))
+        field = self.get_lazy_choices_form().fields[field_name]
+        queryset = field.queryset
+        if not queryset.ordered:
+            queryset = queryset.order_by('pk')
+        lookup = lazy_fields[field_name] if isinstance(lazy_fields, dict) else None
+        if lookup and self.cfg.choices_search:
+            queryset = queryset.filter(**{lookup: self.cfg.choices_search})
+        page_size = settings.LAZY_CHOICES_PAGE_SIZE
+        offset = (self.cfg.choices_page - 1) * page_size
+        objects = list(queryset[offset:offset + page_size + 1])
+        return JsonResponse({
+            'choices': [[field.prepare_value(obj), field.label_from_instance(obj)] for obj in objects[:page_size]],
+            'more': len(objects) > page_size,
+        })
+
+    def get_lazy_choices_form(self):
+        """
+        :return: Form instance providing the lazy choice fields.
+        """
+        self.extra.post(self.request, *self.view.args, **self.view.kwargs)
+        return self.view.get_form()
+
     # noinspection PyBroadException
     def get_form_kwargs(self, kwargs):
         kwargs['user'] = self.request.user
-        kwargs['form_cfg'] = json.loads(self.request.POST.dict().get('form_cfg', '{}'))
+        kwargs['form_cfg'] = codec.loads(self.request.POST.get('form_cfg', '{}'))
         if self.related_object_ids:
             for key, value in self.view.kwargs.items():
                 if key.endswith('_id'):
@@ -364,6 +871,8 @@ class FormPlugin(ModalPlugin):
                 'form_action': self.request.path + '?modal_id=' + self.modal_id,
                 'modal_form': True,
             })
+            if self.json_response:
+                kwargs['form_action'] += '&json_response=true'
         if self.request.is_ajax() and 'form_data' in self.request.GET:
             kwargs.update({
                 'data': self.request.GET,
@@ -371,6 +880,8 @@ class FormPlugin(ModalPlugin):
             })
         if hasattr(self.view, 'form_actions_template'):
             kwargs['form_actions_template'] = self.view.form_actions_template
+        if hasattr(self.view, 'cache_form_actions'):
+            kwargs['cache_form_actions'] = self.view.cache_form_actions
         kwargs['success_url'] = self.view.get_success_url()
         return self.extra.get_form_kwargs(kwargs)
 
@@ -416,6 +927,13 @@ class FormPlugin(ModalPlugin):
             context['headline'] = self.extra._headline_prefix + ' ' + headline
         return self.extra.get_context_data(context)
 
+    def get_json_response_data(self, context):
+        data = super().get_json_response_data(context)
+        form = context.get('form', None)
+        if form is not None and form.is_bound:
+            data['errors'] = {name: [force_text(error) for error in errors] for name, errors in form.errors.items()}
+        return data
+
     def get_success_url(self):
         if not settings.AUTO_SUCCESS_URL:
             return self.super.get_success_url()
@@ -442,18 +960,40 @@ class FormPlugin(ModalPlugin):
 
 
 class FormSetPlugin(FormPlugin):
+    __slots__ = ()
+
+    def get_lazy_choices_form(self):
+        return self.view.construct_formset().empty_form
+
     def formset_valid(self, formset):
+        assign_perm = getattr(getattr(formset, 'Meta', None), 'assign_perm', False)
+        if assign_perm:
+            # copy deleted objects before saving since deleting resets their primary keys
+            deleted_objects = [copy(form.instance) for form in formset.deleted_forms if form.instance.pk is not None]
         self.extra.formset_valid(formset)
+        response = self.super.formset_valid(formset)
+        if assign_perm:
+            bulk_remove_obj_perm(self.request.user, deleted_objects)
+            bulk_assign_obj_perm(self.request.user, self.view.object_list)
         success_message = self.view.success_message  # .format(**formset.cleaned_data)
         if success_message:
             messages.success(self.request, success_message)
+        return response
 
 
 class PreviewFormPlugin(FormPlugin):
+    __slots__ = ('stage',)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.stage = 0
 
+    @property
+    def form_meta(self):
+        if self.stage == 2:
+            return getattr(self.view.get_form_class(), 'Meta', None)
+        return super().form_meta
+
     @property
     def preview_template_name(self):
         return getattr(self.view, 'preview_template_name', 'ajaxviews/generic_form.html')
@@ -465,7 +1005,7 @@ class PreviewFormPlugin(FormPlugin):
         return self.view.preview_form_class
 
     def post(self, request, *args, **kwargs):
-        self.stage = 2 if 'preview_model_form' in request.POST else 1
+        self.stage = 2 if 'preview_token' in request.POST else 1
         return super().post(request, *args, **kwargs)
 
     def get_form_class(self):
@@ -483,25 +1023,70 @@ class PreviewFormPlugin(FormPlugin):
         })
         return kwargs
 
+    @property
+    def preview_session_key(self):
+        return 'ajaxviews:preview:' + self.request.path
+
+    def store_preview(self, form):
+        """
+        Keep the posted data of the validated model form in the session. A new preview of the same path replaces
+        the previous one. File uploads can't be kept between the two stages.
+
+        :return: Signed token bound to the user and the request path.
+        """
+        if form.is_multipart():
+            raise ImproperlyConfigured('Preview forms do not support file fields.')
+        key = uuid4().hex
+        self.request.session[self.preview_session_key] = [key, dict(form.data.lists())]
+        return signing.dumps([key, self.request.user.pk, self.request.path], salt='ajaxviews.preview')
+
+    def load_preview(self, token):
+        """
+        :return: Model form data stored with :meth:`store_preview` or None if the preview has expired.
+        """
+        try:
+            key, user_pk, path = signing.loads(token, salt='ajaxviews.preview', max_age=settings.PREVIEW_TIMEOUT)
+        except signing.SignatureExpired:
+            return None
+        except (signing.BadSignature, ValueError):
+            raise SuspiciousOperation('Invalid preview token.')
+        if user_pk != self.request.user.pk or path != self.request.path:
+            raise SuspiciousOperation('Invalid preview token.')
+        preview = self.request.session.get(self.preview_session_key)
+        if preview is None or preview[0] != key:
+            return None
+        return MultiValueDict(preview[1])
+
+    def get_model_form(self, data, **kwargs):
+        """
+        Rebuild the model form of stage 1 from the data stored with :meth:`store_preview`.
+        """
+        form_kwargs = self.view.get_form_kwargs()
+        form_kwargs.pop('files', None)
+        form_kwargs.update(kwargs, data=data)
+        return self.super.get_form_class()(**form_kwargs)
+
     def form_valid(self, form):
         if self.stage == 1 and form.cleaned_data.get('skip_preview', False):
             return self.view.done(form)
         if self.stage == 2:
             form.cleaned_data.pop('form_cfg', None)
-            form_kwargs = self.view.get_form_kwargs()
-            form_kwargs.update({
-                'preview_data': form.cleaned_data,
-                'data': QueryDict(self.request.POST.get('preview_model_form')),
-            })
-            model_form = self.super.get_form_class()(**form_kwargs)
+            data = self.load_preview(self.request.POST['preview_token'])
+            if data is None:
+                form.add_error(None, 'Preview has expired. Please submit the form again.')
+                return self.form_invalid(form)
+            model_form = self.get_model_form(data, preview_data=form.cleaned_data)
+            # the objects may have changed since the preview
             if not model_form.is_valid():
-                raise ValidationError('Model form did not validate!')
+                return self.form_invalid(model_form)
             if 'success_message' in form.cleaned_form_cfg:
                 messages.success(self.request, form.cleaned_form_cfg['success_message'])
-            return self.view.done(model_form)
+            response = self.view.done(model_form)
+            self.request.session.pop(self.preview_session_key, None)
+            return response
 
         self.view.process_preview(form)
-        self.json_cfg['preview_model_form'] = render_crispy_form(form)
+        self.json_cfg['preview_token'] = self.store_preview(form)
         kwargs = {'model_data': form.cleaned_data}
         preview_form = self.preview_form_class(**self.get_preview_form_kwargs(**kwargs))
         success_message = self.view.success_message.format(**form.cleaned_data)
@@ -522,6 +1107,8 @@ class PreviewFormPlugin(FormPlugin):
 
 # noinspection PyUnresolvedReferences
 class DeletePlugin(AjaxPlugin):
+    __slots__ = ()
+
     def get(self, request, *args, **kwargs):
         if request.GET.get('delete_file', False):
             instance = self.view.get_object()
@@ -1,6 +1,60 @@
 from dateutil.parser import parse
-from django.db.models import QuerySet
-from django.core.exceptions import ImproperlyConfigured
+from django.db.models import QuerySet, Q, Count, Min, Value, IntegerField, CharField
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Cast
+from django.core.exceptions import ImproperlyConfigured, FieldDoesNotExist, ValidationError
+
+
+def is_multi_valued(model, path):
+    """
+    Check whether a lookup path spans a reverse foreign key or many to many relation, so that filtering by it can
+    return the same object several times.
+
+    :param model: Django model class
+    :param str path: Lookup path, e.g. ``'tags__name__in'``
+    :return: True if the path joins a multi-valued relation
+    """
+    opts = model._meta
+    for name in path.split(LOOKUP_SEP):
+        try:
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+        except FieldDoesNotExist:
+            # lookup or transform
+            return False
+        if not field.is_relation or field.related_model is None:
+            return False
+        if field.many_to_many or field.one_to_many:
+            return True
+        opts = field.related_model._meta
+    return False
+
+
+def get_path_field(model, path):
+    """
+    Resolve a field path to the model field that holds its values. Relations are resolved to the field they
+    point to, e.g. the primary key of the related model.
+
+    :param model: Django model class
+    :param str path: Field path, e.g. ``'category__name'``
+    :return: Model field
+    """
+    opts = model._meta
+    field = None
+    for name in path.split(LOOKUP_SEP):
+        field = opts.pk if name == 'pk' else opts.get_field(name)
+        if field.is_relation and field.related_model is not None:
+            opts = field.related_model._meta
+    if field.is_relation and field.related_model is not None:
+        field = getattr(field, 'target_field', field.related_model._meta.pk)
+    return field
+
+
+def _get_lookups(q):
+    for child in q.children:
+        if isinstance(child, Q):
+            yield from _get_lookups(child)
+        else:
+            yield child[0]
 
 
 class AjaxQuerySet(QuerySet):
@@ -15,8 +69,13 @@ class AjaxQuerySet(QuerySet):
         - ``filter_index`` List index of field to filter results. This displays all possible filter options.
         - ``selected_filter_index`` Field of filter to apply on queryset.
         - ``selected_filter_values`` Values to filter by on selected field.
+        - ``filters`` List of filter field and values tuples which are applied together. Replaces
+          ``selected_filter_index`` and ``selected_filter_values`` if present.
+
+    Filters that span multi-valued relations (reverse foreign keys and many to many fields) are applied in a
+    ``pk__in`` subquery, so the objects aren't duplicated and the list query doesn't need ``DISTINCT``.
 
-    :var bool distinct_qs: Apply distinct filter option. Default is True.
+    :var bool distinct_qs: Remove duplicates caused by filters on multi-valued relations. Default is True.
     """
     distinct_qs = True
 
@@ -37,28 +96,71 @@ class AjaxQuerySet(QuerySet):
     def ajax_filter(self, opts, *args, **kwargs):
         # args = set()
         # args.update((Q(field__isnull=True) | Q(field__name='none'),))
-        filter_field = opts.get('filter_field', None)
+        queryset = self
+        for filter_field, values in self.get_selected_filters(opts):
+            lookups = self.get_filter_lookups(filter_field, values)
+            if lookups:
+                queryset = queryset._filter_distinct(**lookups) if self.distinct_qs else queryset.filter(**lookups)
+
+        if not self.distinct_qs:
+            return queryset.filter(*args, **kwargs)
+        return queryset._filter_distinct(*args, **kwargs)
+
+    # noinspection PyMethodMayBeStatic
+    def get_selected_filters(self, opts):
+        """
+        :param opts: Filter options passed through request.
+        :return: List of filter field and values tuples to apply.
+        """
+        if 'filters' in opts:
+            return opts['filters']
+        if opts.get('selected_filter_index', -1) >= 0 and opts.get('selected_filter_values', None):
+            return [(opts['filter_field'], opts['selected_filter_values'])]
+        return []
+
+    # noinspection PyMethodMayBeStatic
+    def get_filter_lookups(self, filter_field, values):
+        """
+        Build the lookups of a single entry of ``filter_fields``.
+
+        :param filter_field: Entry of the view's ``filter_fields``
+        :param values: Selected values of the filter
+        :return: Dictionary of lookups
+        """
+        if not values:
+            return {}
+        if isinstance(filter_field, str):
+            return {filter_field + '__in': values}
         if isinstance(filter_field, tuple) and len(filter_field) == 2 and \
            (filter_field[1] == 'exclude' or filter_field[1] == 'exclude_filter'):
-            return self.filter(*args, **kwargs)
+            return {}
+        if isinstance(filter_field, tuple) and len(filter_field) >= 2 and filter_field[1] == 'search':
+            return {filter_field[0] + '__in': values}
+        if isinstance(filter_field, tuple) and len(filter_field) == 3:
+            return {filter_field[0] + '__in': values}
+        if isinstance(filter_field, tuple) and len(filter_field) == 2 and filter_field[1] == 'date':
+            lookups = {}
+            if values.get('min_date', None):
+                lookups[filter_field[0] + '__gte'] = parse(values['min_date']).date()
+            if values.get('max_date', None):
+                lookups[filter_field[0] + '__lte'] = parse(values['max_date']).date()
+            return lookups
+        raise ImproperlyConfigured('filter field attribute needs to be a string or tuple.')
 
-        if opts.get('selected_filter_index', -1) >= 0 and opts.get('selected_filter_values', None):
-            filter_field = opts['filter_field']
-            if isinstance(filter_field, str):
-                kwargs[filter_field + '__in'] = opts['selected_filter_values']
-            elif isinstance(filter_field, tuple) and len(filter_field) == 3:
-                kwargs[filter_field[0] + '__in'] = opts['selected_filter_values']
-            elif isinstance(filter_field, tuple) and len(filter_field) == 2 and filter_field[1] == 'date':
-                if opts['selected_filter_values'].get('min_date', None):
-                    kwargs[filter_field[0] + '__gte'] = parse(opts['selected_filter_values']['min_date']).date()
-                if opts['selected_filter_values'].get('max_date', None):
-                    kwargs[filter_field[0] + '__lte'] = parse(opts['selected_filter_values']['max_date']).date()
-            else:
-                raise ImproperlyConfigured('filter field attribute needs to be a string or tuple.')
-
-        if self.distinct_qs:
-            return self.filter(*args, **kwargs).distinct()
-        return self.filter(*args, **kwargs)
+    def _filter_distinct(self, *args, **kwargs):
+        """
+        Apply the filters which join multi-valued relations in a subquery that selects the primary keys of matching
+        objects. All other filters are applied to the QuerySet directly.
+        """
+        q_args = [arg for arg in args if isinstance(arg, Q) and
+                  any(is_multi_valued(self.model, path) for path in _get_lookups(arg))]
+        multi_valued = {key: value for key, value in kwargs.items() if is_multi_valued(self.model, key)}
+        if not q_args and not multi_valued:
+            return self.filter(*args, **kwargs)
+        subquery = self.model._base_manager.using(self.db).filter(*q_args, **multi_valued).values('pk')
+        args = [arg for arg in args if arg not in q_args]
+        kwargs = {key: value for key, value in kwargs.items() if key not in multi_valued}
+        return self.filter(*args, pk__in=subquery, **kwargs)
 
     def ajax_sorter(self, opts):
         if opts.get('sort_index', -1) < 0:
@@ -72,6 +174,49 @@ class AjaxQuerySet(QuerySet):
             return self.order_by(field)
         return self.order_by('-' + field)
 
+    def get_facet_counts(self, facets):
+        """
+        Count the objects per distinct value of several fields with grouped aggregates combined in a single
+        ``UNION ALL`` query. Every facet is filtered independently, so that each field can be narrowed down by the
+        filters of the other fields.
+
+        :param facets: List of key, field path and filters tuples. The filters are passed as ``filters`` option to
+            :func:`ajax_filter`.
+        :return: Dictionary of keys mapped to lists of value and count tuples ordered by value
+        """
+        if not facets:
+            return {}
+        fields = [get_path_field(self.model, field) for key, field, filters in facets]
+        querysets = []
+        for index, (key, field, filters) in enumerate(facets):
+            queryset = self.ajax_filter({'filters': filters}) if filters else self
+            # cast to a char field since MySQL can't cast to a text type
+            max_length = getattr(fields[index], 'max_length', None) or 255
+            querysets.append(
+                queryset.order_by()
+                .annotate(ajaxviews_value=Cast(field, CharField(max_length=max_length)))
+                .values('ajaxviews_value')
+                # aggregate the constant so that it isn't added to GROUP BY
+                .annotate(ajaxviews_facet=Min(Value(index, IntegerField())), ajaxviews_count=Count('pk', distinct=True))
+                .values_list('ajaxviews_facet', 'ajaxviews_value', 'ajaxviews_count')
+            )
+        rows = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+
+        counts = {key: [] for key, field, filters in facets}
+        for index, value, count in rows:
+            if value is not None:
+                try:
+                    value = fields[index].to_python(value)
+                except ValidationError:
+                    pass
+            counts[facets[index][0]].append((value, count))
+        for values in counts.values():
+            try:
+                values.sort(key=lambda item: item[0])
+            except TypeError:
+                values.sort(key=lambda item: str(item[0]))
+        return counts
+
     def get_unique_values(self, field):
         """
         Used to get unique values of a given field.
@@ -0,0 +1,161 @@
+import hashlib
+
+from dateutil.parser import parse
+from django.core.exceptions import SuspiciousOperation
+
+from . import codec
+from .conf import settings
+
+
+def parse_json_cfg(data):
+    """
+    Decode the ``json_cfg`` query string parameter. The payload is rejected before decoding if it exceeds
+    ``JSON_CFG_MAX_SIZE`` characters and after decoding if it's nested deeper than ``JSON_CFG_MAX_DEPTH``.
+
+    :param str data: JSON encoded object
+    :return: Decoded dictionary
+    :raises SuspiciousOperation: If the payload is too large, too deep or not a JSON object.
+    """
+    if not data:
+        return {}
+    if len(data) > settings.JSON_CFG_MAX_SIZE:
+        raise SuspiciousOperation('json_cfg exceeds {} characters.'.format(settings.JSON_CFG_MAX_SIZE))
+    try:
+        json_cfg = codec.loads(data)
+    except (ValueError, RecursionError):
+        raise SuspiciousOperation('json_cfg is not valid JSON.')
+    if not isinstance(json_cfg, dict):
+        raise SuspiciousOperation('json_cfg needs to be a JSON object.')
+
+    max_depth = settings.JSON_CFG_MAX_DEPTH
+    stack = [(json_cfg, 1)]
+    while stack:
+        value, depth = stack.pop()
+        if depth > max_depth:
+            raise SuspiciousOperation('json_cfg is nested deeper than {} levels.'.format(max_depth))
+        children = value.values() if isinstance(value, dict) else value
+        stack.extend((child, depth + 1) for child in children if isinstance(child, (dict, list)))
+    return json_cfg
+
+
+# json_cfg keys which only control the presentation of a view and don't change the queried objects
+presentation_fields = (
+    'ajax_load', 'ajax_view', 'view_name', 'init_view_type', 'modal_id', 'full_url',
+    'sort_index', 'sort_order', 'ajax_page_nr', 'cursor',
+    'filter_index', 'ignore_selected_values', 'filter_search', 'filter_page', 'filter_values_only', 'facets',
+    'lazy_choices', 'choices_search', 'choices_page',
+)
+
+
+def get_json_cfg_key(json_cfg, exclude=presentation_fields):
+    """
+    Build a hash of ``json_cfg`` that doesn't depend on the order of keys.
+
+    :param dict json_cfg: Data to hash
+    :param exclude: Keys to ignore. Default: ``presentation_fields``
+    :return: Hex digest
+    """
+    data = {key: value for key, value in json_cfg.items() if key not in exclude}
+    return hashlib.md5(codec.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _index(value):
+    if isinstance(value, bool):
+        raise TypeError('Boolean is not a valid index.')
+    value = int(value)
+    if value < -1:
+        raise ValueError('Expected an index or -1.')
+    return value
+
+
+def _positive(value):
+    value = _index(value)
+    if value < 1:
+        raise ValueError('Expected a positive integer.')
+    return value
+
+
+def _page(value):
+    return value if value == 'last' else _index(value)
+
+
+def _sort_order(value):
+    return value if value in ('asc', 'desc') else None
+
+
+def _filter_values(value):
+    # date filters select a range, all other filters a list of values
+    if value is None:
+        return value
+    if isinstance(value, dict):
+        if set(value) != {'min_date', 'max_date'}:
+            raise ValueError('Expected min_date and max_date.')
+        for date in value.values():
+            if not isinstance(date, str):
+                raise TypeError('Expected a date string.')
+            if date:
+                parse(date)
+        return value
+    if not isinstance(value, list) or any(isinstance(item, (dict, list)) for item in value):
+        raise TypeError('Expected a list of values.')
+    return value
+
+
+def _selected_filters(value):
+    if not isinstance(value, list):
+        raise TypeError('Expected a list of selected filters.')
+    selected_filters = []
+    for index, values in value:
+        index = _index(index)
+        if index < 0:
+            raise ValueError('Expected an index.')
+        selected_filters.append([index, _filter_values(values)])
+    return selected_filters
+
+
+def _modal_id(value):
+    return str(value).replace('#', '')
+
+
+class JsonCfg:
+    """
+    Typed fields of ``json_cfg`` which control the behavior of the plugins. The fields are cleaned once when the
+    request is dispatched and the cleaned values are written back to ``json_cfg``. Fields missing in ``json_cfg``
+    are set to their default value.
+
+    :var dict fields: Field name mapped to a tuple of clean function and default value.
+    """
+    fields = {
+        'filter_index': (_index, -1),
+        'selected_filter_index': (_index, -1),
+        'selected_filter_values': (_filter_values, None),
+        'selected_filters': (_selected_filters, ()),
+        'ignore_selected_values': (bool, False),
+        'filter_search': (str, None),
+        'filter_page': (_positive, 1),
+        'filter_values_only': (bool, False),
+        'facets': (bool, False),
+        'sort_index': (_index, -1),
+        'sort_order': (_sort_order, None),
+        'ajax_page_nr': (_page, None),
+        'cursor': (str, None),
+        'modal_id': (_modal_id, ''),
+        'lazy_choices': (str, None),
+        'choices_search': (str, None),
+        'choices_page': (_positive, 1),
+    }
+    __slots__ = tuple(fields)
+
+    def __init__(self, json_cfg):
+        for name, (clean, default) in self.fields.items():
+            if name not in json_cfg:
+                setattr(self, name, default)
+                continue
+            value = json_cfg[name]
+            if clean is not None:
+                try:
+                    value = clean(value)
+                except (TypeError, ValueError, OverflowError):
+                    raise SuspiciousOperation('Invalid value for json_cfg field {}.'.format(name))
+                json_cfg[name] = value
+            setattr(self, name, value)
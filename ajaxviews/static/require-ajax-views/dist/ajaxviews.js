@@ -46,7 +46,9 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
             if (response == null) {
               response = null;
             }
-            if (response) {
+            if ((response != null ? response.json_cfg : void 0) != null) {
+              return response.json_cfg;
+            } else if (response) {
               return JSON.parse($(response).find(this.cfg.html.cfgNode).html());
             } else {
               return JSON.parse($(this.cfg.html.cfgNode).html());
@@ -109,18 +111,25 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
             }
           };
           Manager.prototype.updateView = function (scope, animate) {
-            var node;
+            var html, node;
             if (animate == null) {
               animate = true;
             }
-            node = $(this.cfg.html.ajaxNode).html($(scope).find(this.cfg.html.ajaxNode).html());
+            html = scope.json_cfg != null ? scope.html : $(scope).find(this.cfg.html.ajaxNode).html();
+            node = $(this.cfg.html.ajaxNode).html(html);
             if (animate) {
               return node.fadeIn('fast');
             }
           };
           Manager.prototype.updateModal = function (modalId, scope) {
+            if (scope.json_cfg != null) {
+              scope = $('<div>').html(scope.html);
+            }
             return $(modalId).find(this.cfg.html.modalNode).replaceWith($(scope).find(this.cfg.html.modalNode));
           };
+          Manager.prototype.updateModalBody = function (modalId, response) {
+            return $(modalId).find(this.cfg.html.modalBodyNode).html(response.html);
+          };
           return Manager;
         }();
         return ViewManager;
@@ -138,7 +147,8 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           html: {
             cfgNode: '#config',
             ajaxNode: '#ajax-content',
-            modalNode: '.modal-dialog'
+            modalNode: '.modal-dialog',
+            modalBodyNode: '.modal-body'
           },
           modules: {
             prefix: '',
@@ -148,6 +158,7 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           },
           mixins: {},
           debug: false,
+          jsonResponse: false,
           defaults: {
             progressBar: { animationSpeed: 300 },
             dragAndDrop: {
@@ -178,6 +189,9 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           if (userCfg.mixins != null) {
             this._cfg.mixins = userCfg.mixins;
           }
+          if (userCfg.jsonResponse != null) {
+            this._cfg.jsonResponse = userCfg.jsonResponse;
+          }
           if (userCfg.debug != null) {
             return this._cfg.debug = userCfg.debug;
           } else if (typeof require === 'function' && typeof require.specified === 'function') {
@@ -240,11 +254,11 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
       var middleware;
       return middleware = {
         onPageLoad: function () {
-          if (this.jsonCfg.preview_model_form) {
+          if (this.jsonCfg.preview_token) {
             $('<input>').attr({
               type: 'hidden',
-              name: 'preview_model_form',
-              value: $(this.jsonCfg.preview_model_form).formSerialize()
+              name: 'preview_token',
+              value: this.jsonCfg.preview_token
             }).appendTo('form[data-async]');
           }
           return $('.url-history-back').click(function (_this) {
@@ -288,7 +302,14 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
                     return $(modalId).modal('hide');
                   } else {
                     _this.jsonCfg = _this._manager.getJsonCfg(response);
-                    _this._manager.updateModal(modalId, response);
+                    if (response.json_cfg != null) {
+                      _this._manager.updateModalBody(modalId, response);
+                      if (_this.onFormErrors != null && response.errors != null) {
+                        _this.onFormErrors(response.errors);
+                      }
+                    } else {
+                      _this._manager.updateModal(modalId, response);
+                    }
                     return _this._loadAjaxView();
                   }
                 };
@@ -500,19 +521,108 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
             if (this.Q('.modal').length) {
               return this.Q('.modal').on('shown.bs.modal', function (_this) {
                 return function (e) {
-                  return _this.Q('.chosen-widget', $(e.currentTarget)).chosen();
+                  return _this.utils.initLazyChoices(_this.Q('.chosen-widget', $(e.currentTarget)).chosen());
                 };
               }(this));
             } else {
-              return this.Q('.chosen-widget').chosen();
+              return this.utils.initLazyChoices(this.Q('.chosen-widget').chosen());
             }
           }
         },
+        initLazyChoices: function (selects) {
+          var i, len, ref, results1, select;
+          ref = $(selects).filter('[data-lazy-choices]').toArray();
+          results1 = [];
+          for (i = 0, len = ref.length; i < len; i++) {
+            select = ref[i];
+            results1.push(function (select) {
+              var container, loadChoices, searchInput, state, url;
+              url = ($(select).closest('form').attr('action') || location.pathname).split('?')[0];
+              container = $(select).next('.chosen-container');
+              searchInput = $(container).find('input').first();
+              state = {
+                search: '',
+                page: 0,
+                more: true,
+                loading: false,
+                timeout: null
+              };
+              loadChoices = function (reset) {
+                var jsonData;
+                if (state.loading || (!reset && !state.more)) {
+                  return;
+                }
+                state.page = reset ? 1 : state.page + 1;
+                state.loading = true;
+                jsonData = {
+                  lazy_choices: $(select).data('lazy-choices'),
+                  choices_search: state.search,
+                  choices_page: state.page
+                };
+                return $.get(url, { 'json_cfg': JSON.stringify(jsonData) }, function (response) {
+                  var j, k, label, len1, len2, option, ref1, ref2, ref3, search, value, values;
+                  state.loading = false;
+                  state.more = response.more;
+                  values = {};
+                  ref1 = $(select).find('option').toArray();
+                  for (j = 0, len1 = ref1.length; j < len1; j++) {
+                    option = ref1[j];
+                    values[option.value] = true;
+                  }
+                  ref2 = response.choices;
+                  for (k = 0, len2 = ref2.length; k < len2; k++) {
+                    ref3 = ref2[k], value = ref3[0], label = ref3[1];
+                    if (!values[value]) {
+                      $('<option>').val(value).text(label).appendTo(select);
+                    }
+                  }
+                  search = $(searchInput).val();
+                  $(select).trigger('chosen:updated');
+                  if (search) {
+                    $(searchInput).val(search).trigger('keyup');
+                  }
+                  if (jsonData.choices_search !== state.search) {
+                    return loadChoices(true);
+                  }
+                });
+              };
+              $(select).on('chosen:showing_dropdown', function () {
+                if (state.page === 0) {
+                  return loadChoices(true);
+                }
+              });
+              $(searchInput).on('keyup', function () {
+                if ($(searchInput).val() === state.search) {
+                  return;
+                }
+                state.search = $(searchInput).val();
+                clearTimeout(state.timeout);
+                return state.timeout = setTimeout(function () {
+                  return loadChoices(true);
+                }, 300);
+              });
+              return $(container).find('.chosen-results').on('scroll', function (e) {
+                var results;
+                results = e.currentTarget;
+                if (results.scrollTop + results.clientHeight >= results.scrollHeight - 20) {
+                  return loadChoices(false);
+                }
+              });
+            }(select));
+          }
+          return results1;
+        },
         initPagination: function () {
           if (this.Q('.pagination').length) {
             return this.Q('.pagination').find('span').click(function (_this) {
               return function (e) {
-                return _this.requestView({ jsonData: { 'ajax_page_nr': parseInt($(e.currentTarget).data('page')) } });
+                var jsonData;
+                if ($(e.currentTarget).data('cursor')) {
+                  jsonData = { 'cursor': $(e.currentTarget).data('cursor') };
+                } else {
+                  jsonData = { 'ajax_page_nr': parseInt($(e.currentTarget).data('page')) };
+                }
+                return _this.requestView({ jsonData: jsonData });
               };
             }(this));
           }
@@ -628,8 +738,8 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
             _jsonData
           ];
         };
-        View.prototype._initRequest = function (viewName, urlKwargs, jsonData, callback) {
-          var _jsonData, _urlKwargs, ref, url;
+        View.prototype._initRequest = function (viewName, urlKwargs, jsonData, jsonResponse, callback) {
+          var _jsonData, _urlKwargs, data, ref, url;
           ref = this._getRequestData(urlKwargs, jsonData), _urlKwargs = ref[0], _jsonData = ref[1];
           if (this._manager.cfg.debug) {
             console.log('Debug request: ', _urlKwargs, _jsonData);
@@ -658,7 +768,11 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           if (url == null) {
             url = location.href;
           }
-          return $.get(url, { 'json_cfg': JSON.stringify(_jsonData) }, function (response) {
+          data = { 'json_cfg': JSON.stringify(_jsonData) };
+          if (jsonResponse) {
+            data.json_response = true;
+          }
+          return $.get(url, data, function (response) {
             return callback(response);
           });
         };
@@ -675,9 +789,9 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           if (animate == null) {
             animate = true;
           }
-          return this._initRequest(viewName, urlKwargs, jsonData, function (_this) {
+          return this._initRequest(viewName, urlKwargs, jsonData, this._manager.cfg.jsonResponse, function (_this) {
             return function (response) {
-              if (!$(response).find(_this._manager.cfg.html.cfgNode).length) {
+              if (response.json_cfg == null && !$(response).find(_this._manager.cfg.html.cfgNode).length) {
                 location.reload();
               }
               _this.jsonCfg = _this._manager.getJsonCfg(response);
@@ -734,15 +848,18 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           }
         };
         View.prototype.requestSnippet = function (arg) {
-          var callback, jsonData, ref, urlKwargs;
-          ref = arg != null ? arg : {}, urlKwargs = ref.urlKwargs, jsonData = ref.jsonData, callback = ref.callback;
+          var callback, jsonData, jsonResponse, ref, urlKwargs;
+          ref = arg != null ? arg : {}, urlKwargs = ref.urlKwargs, jsonData = ref.jsonData, callback = ref.callback, jsonResponse = ref.jsonResponse;
           if (urlKwargs == null) {
             urlKwargs = {};
           }
           if (jsonData == null) {
             jsonData = {};
           }
-          return this._initRequest(null, urlKwargs, jsonData, function (_this) {
+          if (jsonResponse == null) {
+            jsonResponse = false;
+          }
+          return this._initRequest(null, urlKwargs, jsonData, jsonResponse, function (_this) {
             return function (response) {
               return callback(response);
             };
@@ -760,13 +877,20 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
             'modal_id': '#modal_nr' + parseInt(this.modalNr + 1) || '#modal_nr1',
             'json_cfg': jsonData ? JSON.stringify(jsonData) : void 0
           };
+          if (this._manager.cfg.jsonResponse) {
+            data.json_response = true;
+          }
           return $.get(href, data, function (_this) {
             return function (response) {
               var jsonCfg;
-              if (!$(response).find('.modal').length) {
-                location.reload();
+              if (response.json_cfg != null) {
+                $('body').append(response.html);
+              } else {
+                if (!$(response).find('.modal').length) {
+                  location.reload();
+                }
+                $('body').append($(response).find('.modal')[0].outerHTML);
               }
-              $('body').append($(response).find('.modal')[0].outerHTML);
               $(data.modal_id).modal('toggle');
               jsonCfg = _this._manager.getJsonCfg(response);
               return _this._manager.requireModule(jsonCfg, function (View) {
@@ -810,16 +934,36 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           return FilterView.__super__.constructor.apply(this, arguments);
         }
         FilterView.prototype.getJsonData = function () {
-          var selectedFilterIndex, sortIndex;
-          selectedFilterIndex = this.jsonCfg.selected_filter_index;
+          var ref, sortIndex;
           sortIndex = this.jsonCfg.sort_index;
           return {
-            'selected_filter_index': selectedFilterIndex || selectedFilterIndex === 0 ? selectedFilterIndex : void 0,
-            'selected_filter_values': this.jsonCfg.selected_filter_values ? this.jsonCfg.selected_filter_values : void 0,
+            'selected_filters': ((ref = this.jsonCfg.selected_filters) != null ? ref.length : void 0) ? this.jsonCfg.selected_filters : void 0,
             'sort_index': sortIndex || sortIndex === 0 ? sortIndex : void 0,
             'sort_order': sortIndex || sortIndex === 0 ? this.jsonCfg.sort_order : void 0
           };
         };
+        FilterView.prototype.requestFilter = function (filterIndex, values) {
+          var filters, item;
+          filters = function () {
+            var i, len, ref, results;
+            ref = this.jsonCfg.selected_filters || [];
+            results = [];
+            for (i = 0, len = ref.length; i < len; i++) {
+              item = ref[i];
+              if (item[0] !== filterIndex) {
+                results.push(item);
+              }
+            }
+            return results;
+          }.call(this);
+          if (values && !$.isEmptyObject(values)) {
+            filters.push([
+              filterIndex,
+              values
+            ]);
+          }
+          return this.requestView({ jsonData: { 'selected_filters': filters } });
+        };
         FilterView.prototype.onPageLoad = function () {
           var requestSearchInput;
           if (localStorage.getItem('popover_hide_lock')) {
@@ -842,30 +986,21 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           if ($('#default-search-form').length) {
             requestSearchInput = function (_this) {
               return function () {
-                var res;
+                var filterIndex, res;
+                filterIndex = $('#default-search-form #id_value').data('filter-index');
                 if ($('#default-search-form #id_value').val()) {
-                  _this.requestView({
-                    jsonData: {
-                      'selected_filter_index': $('#default-search-form #id_value').data('filter-index'),
-                      'selected_filter_values': function () {
-                        var i, len, ref, results;
-                        ref = $('.yourlabs-autocomplete span');
-                        results = [];
-                        for (i = 0, len = ref.length; i < len; i++) {
-                          res = ref[i];
-                          results.push($(res).text());
-                        }
-                        return results;
-                      }()
+                  _this.requestFilter(filterIndex, function () {
+                    var i, len, ref, results;
+                    ref = $('.yourlabs-autocomplete span');
+                    results = [];
+                    for (i = 0, len = ref.length; i < len; i++) {
+                      res = ref[i];
+                      results.push($(res).text());
                     }
-                  });
+                    return results;
+                  }());
                 } else {
-                  _this.requestView({
-                    jsonData: {
-                      'selected_filter_index': null,
-                      'selected_filter_values': null
-                    }
-                  });
+                  _this.requestFilter(filterIndex, null);
                 }
                 $('#default-search-form #id_value').val('');
                 return $('.yourlabs-autocomplete').remove();
@@ -884,14 +1019,26 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           }
         };
         FilterView.prototype.onAjaxLoad = function () {
-          var filterIndex;
-          filterIndex = this.jsonCfg.selected_filter_index;
-          if (filterIndex || filterIndex === 0) {
-            return $('th[data-filter-index=\'' + filterIndex + '\']').find('> span:first-of-type').css('text-decoration', 'underline');
+          var filterIndex, i, len, ref, ref1, values;
+          ref = this.jsonCfg.selected_filters || [];
+          for (i = 0, len = ref.length; i < len; i++) {
+            ref1 = ref[i], filterIndex = ref1[0], values = ref1[1];
+            $('th[data-filter-index=\'' + filterIndex + '\']').find('> span:first-of-type').css('text-decoration', 'underline');
           }
         };
         FilterView.prototype.onLoad = function () {
           var popover_node;
+          this.facets = null;
+          if (this.jsonCfg.prefetch_facets) {
+            this.requestSnippet({
+              jsonData: { 'facets': true },
+              callback: function (_this) {
+                return function (response) {
+                  return _this.facets = response.facets;
+                };
+              }(this)
+            });
+          }
           this.Q('.table-sort').click(function (_this) {
             return function (e) {
               var data, sort_order;
@@ -924,109 +1071,110 @@ var cs, cs_manager, cs_app, cs_middleware, cs_utils, cs_view, cs_plugins_filterv
           });
           return $(popover_node).on('show.bs.popover', function (_this) {
             return function (e) {
-              var filterIndex, popover;
+              var filterIndex, initPopover, popover, ref;
               popover = $(e.currentTarget).data('bs.popover');
               filterIndex = parseInt($(e.currentTarget).parent().data('filter-index'));
-              return _this.requestSnippet({
-                jsonData: {
-                  'filter_index': filterIndex,
-                  'ignore_selected_values': filterIndex !== _this.jsonCfg.selected_filter_index ? true : void 0
-                },
-                callback: function (response) {
-                  var inputNode, scope;
-                  scope = popover.tip().find('.popover-content');
-                  $(scope).html(response);
-                  $(scope).find('#filter_reset').click(function (e) {
-                    return _this.requestView({
-                      jsonData: {
-                        'selected_filter_index': null,
-                        'selected_filter_values': []
-                      }
-                    });
+              initPopover = function (response) {
+                var inputNode, requestValues, scope, searchTimeout;
+                scope = popover.tip().find('.popover-content');
+                $(scope).html(response);
+                $(scope).find('#filter_reset').click(function (e) {
+                  return _this.requestFilter(filterIndex, null);
+                });
+                if ($(scope).find('.input-daterange').length) {
+                  inputNode = $(scope).find('.input-daterange input').on('show', function () {
+                    return localStorage.setItem('popover_hide_lock', true);
                   });
-                  if ($(scope).find('.input-daterange').length) {
-                    inputNode = $(scope).find('.input-daterange input').on('show', function () {
-                      return localStorage.setItem('popover_hide_lock', true);
-                    });
-                    $(inputNode).datepicker({
-                      format: 'yyyy-mm-dd',
-                      autoclose: true,
-                      calendarWeeks: true,
-                      todayHighlight: true,
-                      todayBtn: true,
-                      weekStart: 1
-                    });
-                    return $(scope).find('#filter_submit').click(function (e) {
-                      return _this.requestView({
-                        jsonData: {
-                          'selected_filter_index': filterIndex,
-                          'selected_filter_values': {
-                            'min_date': $(scope).find('.input-daterange input:first-of-type').val(),
-                            'max_date': $(scope).find('.input-daterange input:last-of-type').val()
-                          }
-                        }
-                      });
-                    });
-                  } else if ($(scope).find('input[type="radio"]').length) {
-                    return $(scope).find('input:radio').change(function (e) {
-                      var data, filterValue;
-                      filterValue = $(e.currentTarget).val();
-                      if (!filterValue || filterValue === 'all') {
-                        data = {
-                          'selected_filter_index': null,
-                          'selected_filter_values': []
-                        };
-                      } else {
-                        data = {
-                          'selected_filter_index': filterIndex,
-                          'selected_filter_values': filterValue
-                        };
-                      }
-                      return _this.requestView({ jsonData: data });
-                    });
-                  } else {
-                    $(scope).find('#select-all').click(function (e) {
-                      return $(scope).find('input[type="checkbox"]').prop('checked', 'checked');
+                  $(inputNode).datepicker({
+                    format: 'yyyy-mm-dd',
+                    autoclose: true,
+                    calendarWeeks: true,
+                    todayHighlight: true,
+                    todayBtn: true,
+                    weekStart: 1
+                  });
+                  return $(scope).find('#filter_submit').click(function (e) {
+                    return _this.requestFilter(filterIndex, {
+                      'min_date': $(scope).find('.input-daterange input:first-of-type').val(),
+                      'max_date': $(scope).find('.input-daterange input:last-of-type').val()
                     });
-                    $(scope).find('#deselect-all').click(function (e) {
-                      return $(scope).find('input[type="checkbox"]').prop('checked', false);
+                  });
+                } else if ($(scope).find('input[type="radio"]').length) {
+                  return $(scope).find('input:radio').change(function (e) {
+                    var filterValue;
+                    filterValue = $(e.currentTarget).val();
+                    if (!filterValue || filterValue === 'all') {
+                      return _this.requestFilter(filterIndex, null);
+                    } else {
+                      return _this.requestFilter(filterIndex, [filterValue]);
+                    }
+                  });
+                } else {
+                  requestValues = function (jsonData, callback) {
+                    return _this.requestSnippet({
+                      jsonData: $.extend({
+                        'filter_index': filterIndex,
+                        'filter_values_only': true,
+                        'filter_search': $(scope).find('input[data-server-search]').val()
+                      }, jsonData),
+                      callback: callback
                     });
-                    $(scope).find('input[type=text]').keyup(function (e) {
-                      var searchString;
-                      if (e.keyCode === 13) {
-                        $('#filter_submit').click();
-                        return;
-                      }
-                      searchString = e.currentTarget.value;
-                      if (searchString != null ? searchString.length : void 0) {
-                        $(scope).find('label.checkbox:containsCaseInsensitive(\'' + searchString + '\')').fadeIn('fast');
-                        return $(scope).find('label.checkbox:not(:containsCaseInsensitive(\'' + searchString + '\'))').fadeOut('fast');
-                      } else {
-                        return $(scope).find('label.checkbox').fadeOut('fast');
-                      }
+                  };
+                  $(scope).on('click', '.filter-more', function (e) {
+                    return requestValues({ 'filter_page': $(e.currentTarget).data('page') }, function (response) {
+                      return $(e.currentTarget).replaceWith(response);
                     });
-                    return $(scope).find('#filter_submit').click(function (e) {
-                      var data, values_list;
-                      values_list = [];
-                      $(scope).find('input[type="checkbox"]:checked:visible').each(function () {
-                        return values_list.push($(this).val());
-                      });
-                      if (values_list.length === 0) {
-                        data = {
-                          'selected_filter_index': null,
-                          'selected_filter_values': []
-                        };
-                      } else {
-                        data = {
-                          'selected_filter_index': filterIndex,
-                          'selected_filter_values': values_list
-                        };
-                      }
-                      return _this.requestView({ jsonData: data });
+                  });
+                  searchTimeout = null;
+                  $(scope).find('#select-all').click(function (e) {
+                    return $(scope).find('input[type="checkbox"]').prop('checked', 'checked');
+                  });
+                  $(scope).find('#deselect-all').click(function (e) {
+                    return $(scope).find('input[type="checkbox"]').prop('checked', false);
+                  });
+                  $(scope).find('input[type=text]').keyup(function (e) {
+                    var searchString;
+                    if (e.keyCode === 13) {
+                      $('#filter_submit').click();
+                      return;
+                    }
+                    if ($(e.currentTarget).is('[data-server-search]')) {
+                      clearTimeout(searchTimeout);
+                      searchTimeout = setTimeout(function () {
+                        return requestValues({}, function (response) {
+                          return $(scope).find('.filter-values').html(response);
+                        });
+                      }, 300);
+                      return;
+                    }
+                    searchString = e.currentTarget.value;
+                    if (searchString != null ? searchString.length : void 0) {
+                      $(scope).find('label.checkbox:containsCaseInsensitive(\'' + searchString + '\')').fadeIn('fast');
+                      return $(scope).find('label.checkbox:not(:containsCaseInsensitive(\'' + searchString + '\'))').fadeOut('fast');
+                    } else {
+                      return $(scope).find('label.checkbox').fadeOut('fast');
+                    }
+                  });
+                  return $(scope).find('#filter_submit').click(function (e) {
+                    var values_list;
+                    values_list = [];
+                    $(scope).find('input[type="checkbox"]:checked:visible').each(function () {
+                      return values_list.push($(this).val());
                     });
-                  }
+                    return _this.requestFilter(filterIndex, values_list);
+                  });
                 }
-              });
+              };
+              if ((ref = _this.facets) != null ? ref[filterIndex] : void 0) {
+                return setTimeout(function () {
+                  return initPopover(_this.facets[filterIndex].html);
+                }, 0);
+              } else {
+                return _this.requestSnippet({
+                  jsonData: { 'filter_index': filterIndex },
+                  callback: initPopover
+                });
+              }
             };
           }(this));
         };
@@ -1,3 +1,194 @@
-from django.test import TestCase
+import datetime
+import gc
+import json
+import tracemalloc
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User, Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.urlresolvers import ResolverMatch
+from django.db import connection
+from django.forms import ModelForm
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.views.generic import ListView, CreateView
+
+from .forms import GenericModelForm
+from .pagination import CursorPaginator
+from .queries import AjaxQuerySet, is_multi_valued
+from .views import AjaxListView, CreateFormView
+
+
+class FilterDistinctTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='user')
+        cls.user.groups.add(Group.objects.create(name='a'), Group.objects.create(name='b'))
+        User.objects.create(username='other')
+
+    @staticmethod
+    def get_sql(queryset):
+        with CaptureQueriesContext(connection) as context:
+            list(queryset)
+        return context.captured_queries[0]['sql'].upper()
+
+    def test_is_multi_valued(self):
+        self.assertFalse(is_multi_valued(User, 'username__in'))
+        self.assertFalse(is_multi_valued(User, 'pk'))
+        self.assertFalse(is_multi_valued(Permission, 'content_type__app_label'))
+        self.assertTrue(is_multi_valued(User, 'groups__name__in'))
+        self.assertTrue(is_multi_valued(Group, 'user__username'))
+        self.assertTrue(is_multi_valued(ContentType, 'permission__codename'))
+
+    def test_local_field(self):
+        sql = self.get_sql(AjaxQuerySet(User)._filter_distinct(username__in=['user']))
+        self.assertEqual(sql.count('SELECT'), 1)
+        self.assertNotIn('DISTINCT', sql)
+
+    def test_forward_foreign_key(self):
+        sql = self.get_sql(AjaxQuerySet(Permission)._filter_distinct(content_type__app_label='auth'))
+        self.assertEqual(sql.count('SELECT'), 1)
+        self.assertIn('JOIN', sql)
+        self.assertNotIn('DISTINCT', sql)
+
+    def test_many_to_many(self):
+        sql = self.get_sql(AjaxQuerySet(User)._filter_distinct(groups__name__in=['a', 'b']))
+        self.assertEqual(sql.count('SELECT'), 2)
+        self.assertEqual(sql.count('IN (SELECT'), 1)
+        self.assertNotIn('DISTINCT', sql)
+
+    def test_ajax_filter(self):
+        queryset = AjaxQuerySet(User).ajax_filter({'filters': [('groups__name', ['a', 'b']), ('username', ['user'])]})
+        with self.assertNumQueries(1):
+            self.assertEqual(list(queryset), [self.user])
+
+
+class CursorPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        date = datetime.datetime(2016, 1, 1, 12, 0, 0, 100)
+        for index in range(5):
+            # several users joined within the same millisecond
+            User.objects.create(username='n{}'.format(index), date_joined=date + datetime.timedelta(microseconds=index))
+
+    def get_usernames(self, descending):
+        paginator = CursorPaginator(User.objects.filter(username__startswith='n'), 2, 'date_joined', descending)
+        page = paginator.page()
+        usernames = [user.username for user in page.object_list]
+        for index in range(5):
+            if not page.next_cursor:
+                return usernames
+            page = paginator.page(page.next_cursor)
+            usernames += [user.username for user in page.object_list]
+        self.fail('Pagination did not end.')
+
+    def test_datetime_field(self):
+        self.assertEqual(self.get_usernames(False), ['n0', 'n1', 'n2', 'n3', 'n4'])
+        self.assertEqual(self.get_usernames(True), ['n4', 'n3', 'n2', 'n1', 'n0'])
+
+
+class FacetList(AjaxListView):
+    model = Group
+    filter_fields = ['name', ('name', 'exclude_sort'), ('name', 'set', (('a', 'Group A'),)), ('name', 'exclude')]
+
+
+class FacetTest(TestCase):
+    def test_facets(self):
+        Group.objects.create(name='a')
+        Group.objects.create(name='b')
+        request = RequestFactory().get('/', {'json_cfg': json.dumps({'facets': True})},
+                                       HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        request.user = User()
+        request.resolver_match = ResolverMatch(FacetList.as_view(), (), {}, url_name='list_groups')
+        with mock.patch.object(Group, 'objects', AjaxQuerySet(Group)):
+            facets = json.loads(FacetList.as_view()(request).content.decode())['facets']
+        self.assertEqual(sorted(facets), ['0', '1', '2'])
+        self.assertEqual(facets['1']['values'], [['a', 'a', 1], ['b', 'b', 1]])
+        self.assertEqual(facets['2']['values'], [['a', 'Group A', 1], ['b', 'b', 1]])
+
+
+class GroupForm(GenericModelForm):
+    class Meta:
+        model = Group
+        fields = ['name']
+        headline = 'Group'
+
+
+class PlainGroupForm(ModelForm):
+    class Meta:
+        model = Group
+        fields = ['name']
+
+
+class GroupList(AjaxListView):
+    model = Group
+    queryset = Group.objects.order_by('pk')
+    paginate_by = 10
+    template_name = 'ajaxviews/__json_base.html'
+
+
+class PlainGroupList(ListView):
+    model = Group
+    queryset = Group.objects.order_by('pk')
+    paginate_by = 10
+    template_name = 'ajaxviews/__json_base.html'
+
+
+class GroupCreate(CreateFormView):
+    form_class = GroupForm
+    success_url = '/'
+    template_name = 'ajaxviews/__json_base.html'
+
+
+class PlainGroupCreate(CreateView):
+    form_class = PlainGroupForm
+    success_url = '/'
+    template_name = 'ajaxviews/__json_base.html'
+
+
+class RequestAllocationTest(TestCase):
+    """
+    The per request state of views and plugins has to stay within a budget of allocated memory. The budget is
+    relative to the peak memory allocated by a request to the equivalent plain Django view in the same interpreter,
+    so it doesn't depend on the size of python objects. Both views render the same template to compare the request
+    processing only.
+    """
+    # the ajax views may allocate at most 50% more than the plain views (currently 8% for lists and 27% for forms)
+    margin = 1.5
+
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(20):
+            Group.objects.create(name='group{}'.format(index))
+
+    @staticmethod
+    def get_peak_size(view_class, ajax):
+        view = view_class.as_view()
+        headers = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'} if ajax else {}
+
+        def request_view():
+            request = RequestFactory().get('/', **headers)
+            request.user = User()
+            request.resolver_match = ResolverMatch(view, (), {}, url_name='group')
+            view(request).render()
+
+        # load templates and compose the plugin classes before measuring
+        request_view()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            request_view()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def assert_budget(self, view_class, plain_view_class):
+        for ajax in (False, True):
+            budget = self.get_peak_size(plain_view_class, ajax) * self.margin
+            self.assertLess(self.get_peak_size(view_class, ajax), budget)
+
+    def test_list_view(self):
+        self.assert_budget(GroupList, PlainGroupList)
+
+    def test_form_view(self):
+        self.assert_budget(GroupCreate, PlainGroupCreate)
@@ -1,4 +1,8 @@
-from django.http import HttpResponseRedirect
+from functools import partial
+
+from django.contrib.messages import get_messages
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponseRedirect, JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
@@ -8,8 +12,11 @@ try:
 except ImportError:
     ModelFormSetView = type('', (), {})
 
+from .cache import watch_model
+from .conditional import get_not_modified_response, set_validators
 from .conf import settings
 from .forms import ModelFormSet
+from .schema import JsonCfg
 from .plugins import PluginAdapter, AjaxPlugin, ListPlugin, DetailPlugin, FormPlugin, PreviewFormPlugin,\
     FormSetPlugin, DeletePlugin, CreateForm, UpdateForm
 
@@ -58,19 +65,62 @@ class ViewFactory:
                     raise LookupError('Extension plugin {} not supported!'.format(extra))
             self.name = args[0]
             self.extra_names = args[1:]
+        self.adapter_class = PluginAdapter.for_controls(self._extras[name] for name in self.extra_names)
+        self._plugin_classes = {}
+
+    def get_plugin_class(self, view_class, **kwargs):
+        """
+        Return the plugin class composed for a view class. It's created once per view class and init kwargs with
+        the static attributes computed by the plugin's ``get_static_attrs`` method.
+
+        :param view_class: Class of the view using the plugin
+        :param kwargs: Init kwargs passed to ``as_view``
+        :return: Subclass of the plugin
+        """
+        key = (view_class, kwargs.get('form_class', None), 'model' in kwargs)
+        if key not in self._plugin_classes:
+            plugin_class = self._plugins[self.name]
+            attrs = plugin_class.get_static_attrs(view_class, **kwargs)
+            attrs.update({
+                'adapter_class': self.adapter_class,
+                'extra_classes': tuple(self._extras[name] for name in self.extra_names),
+                '__slots__': (),
+            })
+            self._plugin_classes[key] = type(view_class.__name__ + plugin_class.__name__, (plugin_class,), attrs)
+        return self._plugin_classes[key]
 
     def create(self, view, super_call, **kwargs):
-        instance = self._plugins[self.name](view, **kwargs)
-        instance.super = super_call
-        control_list = []
-        for name in self.extra_names:
-            extra = self._extras[name]()
-            extra.plugin = instance
-            extra.view = view
-            extra.super = super_call
-            control_list.append(extra)
-        instance.extra = PluginAdapter(control_list)
-        return instance
+        return self.get_plugin_class(view.__class__, **kwargs)(view, super_call)
+
+
+def cache_response(timeout=None, vary=(), models=()):
+    """
+    Class decorator to cache the responses of GET requests to a view extending :class:`GenericBaseView`.
+
+    Responses are cached per view, normalized ``json_cfg`` and query parameters, and invalidated when an instance
+    of the view's ``model`` or one of ``models`` is saved or deleted. Responses using a CSRF token or setting
+    cookies are not cached. Views with ``filter_user`` always vary on the user.
+
+    .. code-block:: python
+
+        @cache_response(vary=('group', 'language'))
+        class ProductList(AjaxListView):
+            model = Product
+
+    :param int timeout: Seconds to cache a response. Default: ``RESPONSE_CACHE_TIMEOUT``
+    :param vary: Names of request properties the response depends on: ``'user'``, ``'group'`` or ``'language'``.
+    :param models: Other model classes the response depends on.
+    """
+    for name in vary:
+        if name not in ('user', 'group', 'language'):
+            raise ImproperlyConfigured('Response cache can not vary on {}.'.format(name))
+
+    def decorator(view_class):
+        view_class.response_cache_timeout = settings.RESPONSE_CACHE_TIMEOUT if timeout is None else timeout
+        view_class.response_cache_vary = tuple(vary)
+        view_class.response_cache_models = tuple(models)
+        return view_class
+    return decorator
 
 
 class GenericBaseView:
@@ -80,6 +130,13 @@ class GenericBaseView:
     It merges the query string from the GET request with the keyword arguments retrieved from
     Django's URL conf into ``json_cfg``.
 
+    If a ``json_response`` is requested in the query string, the response is a JSON object with ``json_cfg`` and
+    the ``html`` of the ``main_content`` block only, or the modal markup for modal GET requests. Responses of
+    bound forms also contain the field ``errors``.
+
+    GET requests are answered with *304 Not Modified* if the ETag or last modified date returned by
+    :meth:`get_validators` match the request headers, before the view's queries run or its template is rendered.
+
     You can control the behaviour of your views by extending from this view and setting the :attr:`plugin`
     class attribute.
 
@@ -87,26 +144,69 @@ class GenericBaseView:
     :ivar bool ajax_view: Set to True if you have created a client side module associated with the view
         class that's inheriting from this view.
     :ivar dict json_cfg: Data parsed from incoming requests and returned in each response.
+    :ivar object cfg: Typed fields of ``json_cfg`` cleaned on dispatch.
     :ivar str page_size: Define the width of the view.
+    :var class json_cfg_class: Class used to clean ``cfg``. Default: :class:`ajaxviews.schema.JsonCfg`
+    :var str json_base_template: Template extended instead of ``generic_template`` if a ``json_response`` is
+        requested. Default: ``'ajaxviews/__json_base.html'``
+    :var str last_modified_field: Date or datetime field of the model that's updated on every change of an
+        object. List and detail views use it to validate conditional GET requests.
+    :var int response_cache_timeout: Set by :func:`cache_response`. Default: ``0`` (no caching)
     """
+    plugin = ViewFactory()
     ajax_view = False
+    json_cfg_class = JsonCfg
+    response_cache_timeout = 0
+    response_cache_vary = ()
+    response_cache_models = ()
 
     def __init__(self, *args, **kwargs):
         self.json_cfg = {}
+        self.cfg = None
         self.ajax_view = kwargs.pop('ajax_view', self.ajax_view)
-        self._plugin = getattr(self, 'plugin', ViewFactory()).create(self, super(), **kwargs)
+        self._plugin = self.plugin.create(self, super(), **kwargs)
         if self._plugin.view_kwargs:
             kwargs.update(self._plugin.view_kwargs)
         super().__init__(*args, **kwargs)
 
+    @classmethod
+    def as_view(cls, **initkwargs):
+        cls.plugin.get_plugin_class(cls, **initkwargs)
+        if cls.response_cache_timeout:
+            for model in (initkwargs.get('model', getattr(cls, 'model', None)),) + cls.response_cache_models:
+                if model is not None:
+                    watch_model(model)
+        return super().as_view(**initkwargs)
+
     def dispatch(self, request, *args, **kwargs):
         self._plugin.dispatch(request, *args, **kwargs)
-        return super().dispatch(request, *args, **kwargs)
+        # pending messages have to be rendered
+        if request.method not in ('GET', 'HEAD') or get_messages(request):
+            return super().dispatch(request, *args, **kwargs)
+        etag, last_modified = self.get_validators()
+        response = get_not_modified_response(request, etag, last_modified)
+        if response is None:
+            response = self._plugin.get_cached_response(partial(super().dispatch, request, *args, **kwargs))
+        return set_validators(response, etag, last_modified)
+
+    def get_validators(self):
+        """
+        Compute the validators of the response for conditional GET requests. Override this to track other data
+        the response depends on, e.g. with ``self._plugin.get_etag(*parts)``.
+
+        :return: Tuple of an unquoted ETag and the last modified date or datetime. Either may be None.
+        """
+        return self._plugin.get_validators()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         return self._plugin.get_context_data(context)
 
+    def render_to_response(self, context, **response_kwargs):
+        if self._plugin.json_response:
+            return JsonResponse(self._plugin.get_json_response_data(context))
+        return super().render_to_response(context, **response_kwargs)
+
 
 # noinspection PyUnresolvedReferences
 class AjaxListView(GenericBaseView, ListView):
@@ -145,20 +245,50 @@ class AjaxListView(GenericBaseView, ListView):
 
             - ``('<field_path>', 'date')`` Filter by date range
             - ``('<field_path>', 'set', <set_of_tuples>)`` Filter by first element of tuple
+            - ``('<field_path>', 'search')`` Search and load filter values page by page on the server side.
+              Add a lookup as third element to change the default ``icontains`` lookup.
             - ``('<field_path>', 'exclude')`` Ignore filter, use ``exclude_filter`` or ``exclude_sort`` to
               only ignore one of these.
 
     The ``filter_index`` and ``sort_index`` parameters can be applied independently on different fields.
 
+    Several columns can be filtered at once by passing ``selected_filters`` in the ``json_cfg``, a list of
+    ``[filter_index, values]`` pairs. The values displayed in a filter popover are narrowed down by the other
+    selected filters. With ``facets`` set in the ``json_cfg`` the values, object counts and rendered popovers of all
+    filter fields are returned as JSON.
+
     :ivar list filter_fields: List of fields to be filtered when a ``selected_filter_index`` and
         ``selected_filter_values`` are passed in the request. The index matches the order of the list.
     :ivar bool filter_user: Whether to filter objects the authenticated user has access to. Default is False.
     :ivar int paginate_by: Number of results by which to paginate.
+    :ivar bool cursor_pagination: Paginate by the active sort field and the primary key using
+        :class:`ajaxviews.pagination.CursorPaginator` instead of page numbers. This avoids ``COUNT`` and ``OFFSET``
+        queries on large tables. Default is False.
+    :ivar str count_strategy: How the paginator counts the filtered objects. ``'exact'`` runs a ``COUNT`` query
+        for each page, ``'cached'`` caches the exact count per filter options for ``count_cache_timeout`` seconds
+        and ``'estimate'`` uses the PostgreSQL query planner's estimate if it exceeds ``count_estimate_threshold``
+        rows. Estimated counts are displayed as "about N" in the pagination. Default: ``COUNT_STRATEGY``
+    :ivar int count_cache_timeout: Default: ``COUNT_CACHE_TIMEOUT``
+    :ivar int count_estimate_threshold: Default: ``COUNT_ESTIMATE_THRESHOLD``
     :ivar int filter_search_input_by: Number of results in list view filters by which to display a search input.
+    :ivar int filter_page_size: Number of values loaded at once for ``search`` filter fields.
+        Default: ``FILTER_PAGE_SIZE``
+    :ivar bool prefetch_facets: Let :class:`FilterView` load the values and object counts of all filter popovers in
+        one request after the view is loaded, instead of requesting each popover when it's opened. Default is False.
+    :ivar int filter_cache_timeout: Seconds to cache the values displayed in filter popovers. The cache is
+        invalidated when an instance of ``model`` is saved or deleted. Default: ``FILTER_CACHE_TIMEOUT``
     :ivar int search_field: Name of the autocomplete class that's registered with ``django-autocomplete-ligth``.
     """
     plugin = ViewFactory('list')
 
+    @classmethod
+    def as_view(cls, **initkwargs):
+        model = initkwargs.get('model', cls.model)
+        if model is not None and (getattr(cls, 'filter_cache_timeout', settings.FILTER_CACHE_TIMEOUT) or
+                                  getattr(cls, 'count_strategy', settings.COUNT_STRATEGY) == 'cached'):
+            watch_model(model)
+        return super().as_view(**initkwargs)
+
     def get(self, request, *args, **kwargs):
         # Called for all GET requests
         # :param request: Request object
@@ -170,6 +300,12 @@ class AjaxListView(GenericBaseView, ListView):
     def get_queryset(self, **kwargs):
         return self._plugin.get_queryset(**kwargs)
 
+    def paginate_queryset(self, queryset, page_size):
+        return self._plugin.paginate_queryset(queryset, page_size)
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        return self._plugin.get_paginator(queryset, per_page, orphans, allow_empty_first_page, **kwargs)
+
 
 # noinspection PyUnresolvedReferences
 class AjaxDetailView(GenericBaseView, DetailView):
@@ -215,6 +351,8 @@ class BaseFormView(GenericBaseView):
     :var str success_message: Message to display on successful form save. Default: ``''``
     :var str form_actions_template: Action buttons rendered at the bottom of the form.
         Default: ``'ajaxviews/_form_controls.html'``
+    :var bool cache_form_actions: Set to False to render the form actions without the cache configured by
+        ``FORM_ACTIONS_CACHE_SIZE``. Default: ``True``
     """
     template_name = 'ajaxviews/generic_form.html'
     success_message = ''
@@ -224,6 +362,9 @@ class BaseFormView(GenericBaseView):
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
+    def get(self, request, *args, **kwargs):
+        return self._plugin.get(request, *args, **kwargs) or super().get(request, *args, **kwargs)
+
     def post(self, request, *args, **kwargs):
         return self._plugin.post(request, *args, **kwargs)
 
@@ -251,6 +392,11 @@ class BaseFormSetView(GenericBaseView):
 
     The ``success_url`` is passed on to the formset and a message is displayed on successful form save if
     ``success_message`` has been added to the view class.
+
+    Assign django-guardian's object permissions to saved objects and remove them from deleted objects if the
+    formset's meta has an ``assign_perm`` attribute. Permissions are assigned and removed in bulk.
+
+    Options of the ``lazy_choice_fields`` are loaded from the formset's empty form.
     """
     # template_name = 'ajaxviews/generic_form.html'
     success_message = ''
@@ -266,9 +412,11 @@ class BaseFormSetView(GenericBaseView):
     #     kwargs.update(self.get_formset_kwargs())
     #     return self._plugin.get_form_kwargs(kwargs)
 
+    def get(self, request, *args, **kwargs):
+        return self._plugin.get(request, *args, **kwargs) or super().get(request, *args, **kwargs)
+
     def formset_valid(self, formset):
-        self._plugin.formset_valid(formset)
-        return super().formset_valid(formset)
+        return self._plugin.formset_valid(formset)
 
     def get_formset_kwargs(self):
         kwargs = super().get_formset_kwargs()
@@ -332,6 +480,11 @@ class PreviewCreateView(BaseFormView, CreateView):
         - 1 - POST: submitted model form and render preview form (process_preview)
         - 2 - POST: submitted preview form and save model form (done)
 
+    The submitted data of the model form is kept in the session between stage 1 and 2 for ``PREVIEW_TIMEOUT``
+    seconds and validated again at stage 2. The preview form only posts back a signed ``preview_token``. If the
+    preview has expired, the preview form is displayed again with an error. Model forms with file fields are not
+    supported.
+
     :param str preview_template_name: Template to use to render the preview.
         Default: ``'ajaxviews/generic_form.html'``
     :param object preview_form_class: Form class to use for preview stage e.g. :class:`SimpleForm`.
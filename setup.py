@@ -49,7 +49,7 @@ setup(
         ],
     },
     install_requires=[
-        'Django>=1.9',
+        'Django>=1.11',
         'django-require',
         'django-js-reverse',
         'django-crispy-forms',